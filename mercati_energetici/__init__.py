@@ -3,3 +3,15 @@
 from .electricity_markets import MercatiElettrici, MGP
 from .gas_markets import MercatiGas
 from .environmental_markets import MercatiAmbientali
+from .client import GME
+from .cache import MemoryCache, SQLiteCache
+from .transports import AiohttpTransport, HTTP2Transport, FakeTransport
+from .archive import Archive, write_archive
+from .timeseries import TimeSeries
+from .pipeline import run_pipeline
+from .breaker import CircuitBreaker
+from .hedging import HedgePolicy
+from .profiling import Profiler
+from .warmup import WarmupSpec
+from .bulk import BulkResult, gather_with_deadline
+from .changes import ChangeTracker
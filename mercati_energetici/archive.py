@@ -0,0 +1,169 @@
+"""Memory-mapped binary archive of hourly zonal data"""
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import date, timedelta
+
+MAGIC = b"GMEARCH1"
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def write_archive(
+    path: str, data: dict[date, dict[str, dict[int, float]]], periods: int = 25
+) -> None:
+    """Write hourly zonal data (prices or volumes) to a binary archive.
+
+    The archive stores, for every zone, a contiguous array of ``float64`` values
+    with ``periods`` slots per day, from the first to the last day in ``data``.
+    Missing days, hours and zones are stored as NaN.
+
+    Args:
+        path: Path of the archive file.
+        data: A Python dictionary like: ``{ day: { zone: { hour: value } } }``,
+              for example built from ``MGP.get_zonal_prices``.
+        periods: Slots per day. Default is 25, enough for hourly data on days
+                 with a daylight saving time change.
+    """
+
+    if not data:
+        raise ValueError("No data to archive")
+    start, end = min(data), max(data)
+    days = (end - start).days + 1
+    zones = sorted({zone for zones in data.values() for zone in zones})
+    zone_index = {zone: index for index, zone in enumerate(zones)}
+
+    values = array("d", [float("nan")]) * (len(zones) * days * periods)
+    for day, zonal in data.items():
+        day_offset = (day - start).days * periods
+        for zone, hourly in zonal.items():
+            offset = zone_index[zone] * days * periods + day_offset
+            for hour, value in hourly.items():
+                if not 0 <= hour < periods:
+                    raise ValueError(f"Hour {hour} of {day} exceeds {periods} periods")
+                if value is not None:
+                    values[offset + hour] = value
+
+    if sys.byteorder != "little":
+        values.byteswap()
+    header = json.dumps(
+        {"start": start.isoformat(), "days": days, "periods": periods, "zones": zones}
+    ).encode("utf-8")
+    # Align the values to 8 bytes so they can be mapped as doubles
+    padding = -(len(MAGIC) + _HEADER_LENGTH.size + len(header)) % 8
+    header += b" " * padding
+    with open(path, "wb") as archive:
+        archive.write(MAGIC)
+        archive.write(_HEADER_LENGTH.pack(len(header)))
+        archive.write(header)
+        values.tofile(archive)
+
+
+class Archive:
+    """
+    Read-only, memory-mapped view of an archive written by ``write_archive``.
+    Data is loaded lazily by the operating system, so opening an archive of
+    any size is near-instant and slices do not copy the values.
+    Values are stored little-endian: on big-endian hosts they are instead
+    copied to memory and byteswapped when the archive is opened.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open an archive.
+
+        Args:
+            path: Path of the archive file.
+        """
+
+        with open(path, "rb") as archive:
+            self._mmap = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a mercati-energetici archive")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))
+        offset = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._mmap[offset : offset + header_length])
+        self.start: date = date.fromisoformat(header["start"])
+        self.days: int = header["days"]
+        self.periods: int = header["periods"]
+        self.zones: list[str] = header["zones"]
+        self._buffer = memoryview(self._mmap)
+        self._values = self._buffer[offset + header_length :].cast("d")
+        if sys.byteorder != "little":
+            values = array("d", self._values)
+            values.byteswap()
+            self._values.release()
+            self._values = memoryview(values)
+
+    @property
+    def end(self) -> date:
+        """The last day in the archive."""
+        return self.start + timedelta(days=self.days - 1)
+
+    def slice(
+        self, zone: str, start: date | None = None, end: date | None = None
+    ) -> memoryview:
+        """Get the values of a zone between two days (included), without copying.
+
+        Args:
+            zone: The zone to get values of.
+            start: First day of the slice. Default is the first day in the archive.
+            end: Last day of the slice. Default is the last day in the archive.
+
+        Returns:
+            A flat ``memoryview`` of doubles, where the value of period ``p`` of
+            the ``i``-th day is at index ``i * periods + p``. Missing values are NaN.
+            It can be wrapped without copies, e.g. with ``numpy.frombuffer``.
+        """
+
+        if zone not in self.zones:
+            raise KeyError(
+                f"Zone '{zone}' not found. Available zones are: {self.zones}"
+            )
+        first = 0 if start is None else (start - self.start).days
+        last = self.days - 1 if end is None else (end - self.start).days
+        if first < 0 or last >= self.days or first > last:
+            raise IndexError(f"Days out of the archive range {self.start}-{self.end}")
+        offset = self.zones.index(zone) * self.days * self.periods
+        return self._values[
+            offset + first * self.periods : offset + (last + 1) * self.periods
+        ]
+
+    def get_day(self, day: date, zone: str) -> dict[int, float]:
+        """Get the values of a zone on a day, skipping missing values.
+
+        Args:
+            day: The day to get values of.
+            zone: The zone to get values of.
+
+        Returns:
+            A Python dictionary like: ``{ hour : value }``
+        """
+
+        values = self.slice(zone, day, day)
+        return {hour: value for hour, value in enumerate(values) if value == value}
+
+    def close(self) -> None:
+        """Unmap the archive. Slices obtained from it must be released before."""
+        self._values.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> Archive:
+        """Enter.
+
+        Returns:
+            The Archive object.
+        """
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        """Exit.
+
+        Args:
+            _exc_info: Exec type.
+        """
+        self.close()
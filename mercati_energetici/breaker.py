@@ -0,0 +1,155 @@
+"""Circuit breaker for GME outages"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from .exceptions import MercatiEnergeticiCircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+@dataclass
+class _Circuit:
+    """State of the circuit of a single host."""
+
+    state: str = CLOSED
+    outcomes: deque = field(default_factory=deque)
+    opened_at: float = 0.0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    While closed, requests go through and their outcomes are recorded. When the
+    failure rate over the last ``window`` seconds reaches ``failure_rate`` (with at
+    least ``min_requests`` requests), the circuit opens and requests fail fast with
+    ``MercatiEnergeticiCircuitOpenError``, or are served from the cache if possible.
+    After ``recovery_time`` seconds the circuit is half-open: up to
+    ``half_open_requests`` probe requests go through, and the circuit closes if
+    they succeed or opens again if they fail.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_requests: int = 10,
+        window: float = 60.0,
+        recovery_time: float = 30.0,
+        half_open_requests: int = 1,
+    ) -> None:
+        """Create the circuit breaker.
+
+        Args:
+            failure_rate: Fraction of failed requests opening the circuit.
+            min_requests: Minimum number of requests in the window before the
+                failure rate is evaluated.
+            window: Seconds of request outcomes considered for the failure rate.
+            recovery_time: Seconds the circuit stays open before probing.
+            half_open_requests: Maximum number of concurrent probe requests.
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.recovery_time = recovery_time
+        self.half_open_requests = half_open_requests
+        self._circuits: dict[str, _Circuit] = {}
+
+    def state(self, host: str) -> str:
+        """Get the state of the circuit of a host.
+
+        Args:
+            host: The host.
+
+        Returns:
+            One of "closed", "open" or "half-open".
+        """
+        circuit = self._circuits.get(host, _Circuit())
+        if circuit.state == OPEN and self._recovered(circuit):
+            return HALF_OPEN
+        return circuit.state
+
+    def before_request(self, host: str) -> None:
+        """Check if a request to a host can be sent, and count it if it's a probe.
+        Every allowed request must be followed by a call to ``record_success``,
+        ``record_failure`` or ``record_cancelled``.
+
+        Args:
+            host: The host.
+
+        Raises:
+            MercatiEnergeticiCircuitOpenError: The circuit is open.
+        """
+        circuit = self._circuits.setdefault(host, _Circuit())
+        if circuit.state == OPEN and self._recovered(circuit):
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+        if circuit.state == OPEN or (
+            circuit.state == HALF_OPEN and circuit.probes >= self.half_open_requests
+        ):
+            raise MercatiEnergeticiCircuitOpenError(
+                f"The circuit to {host} is open after repeated failures"
+            )
+        if circuit.state == HALF_OPEN:
+            circuit.probes += 1
+
+    def record_success(self, host: str) -> None:
+        """Record a successful request.
+
+        Args:
+            host: The host.
+        """
+        circuit = self._circuits.setdefault(host, _Circuit())
+        if circuit.state == HALF_OPEN:
+            self._circuits[host] = _Circuit()
+        elif circuit.state == CLOSED:
+            self._record(circuit, True)
+
+    def record_failure(self, host: str) -> None:
+        """Record a failed request, opening the circuit if needed.
+
+        Args:
+            host: The host.
+        """
+        circuit = self._circuits.setdefault(host, _Circuit())
+        if circuit.state == HALF_OPEN:
+            self._open(circuit)
+        elif circuit.state == CLOSED:
+            self._record(circuit, False)
+            requests = len(circuit.outcomes)
+            failures = sum(1 for _, success in circuit.outcomes if not success)
+            if (
+                requests >= self.min_requests
+                and failures >= self.failure_rate * requests
+            ):
+                self._open(circuit)
+
+    def record_cancelled(self, host: str) -> None:
+        """Record a request cancelled before completion, releasing its probe slot.
+
+        Args:
+            host: The host.
+        """
+        circuit = self._circuits.setdefault(host, _Circuit())
+        if circuit.state == HALF_OPEN and circuit.probes > 0:
+            circuit.probes -= 1
+
+    def _record(self, circuit: _Circuit, success: bool) -> None:
+        now = time.monotonic()
+        circuit.outcomes.append((now, success))
+        while circuit.outcomes and circuit.outcomes[0][0] < now - self.window:
+            circuit.outcomes.popleft()
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.outcomes.clear()
+        circuit.probes = 0
+
+    def _recovered(self, circuit: _Circuit) -> bool:
+        return time.monotonic() - circuit.opened_at >= self.recovery_time
@@ -0,0 +1,76 @@
+"""Bulk operations with an overall deadline and partial results"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Hashable
+
+
+@dataclass
+class BulkResult:
+    """Results of a bulk operation.
+
+    Attributes:
+        results: The results of the successful items, by key.
+        errors: The exceptions of the failed items, by key. Items not completed
+            by the deadline have an ``asyncio.TimeoutError``.
+    """
+
+    results: dict[Hashable, Any] = field(default_factory=dict)
+    errors: dict[Hashable, BaseException] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Whether all the items succeeded."""
+        return not self.errors
+
+
+async def gather_with_deadline(
+    calls: dict[Hashable, Awaitable[Any]], deadline: float | None = None
+) -> BulkResult:
+    """Run many calls concurrently, collecting their results and errors.
+
+    Unlike ``asyncio.gather``, a failing call neither cancels the others nor
+    hides their results, and calls still running at the deadline are cancelled
+    so that the batch completes in bounded time. For example:
+
+    ```python
+    result = await gather_with_deadline(
+        {day: mgp.get_prices(day) for day in days}, deadline=30
+    )
+    for day, error in result.errors.items():
+        print(f"{day} failed: {error!r}")
+    ```
+
+    Args:
+        calls: The awaitables to run, by key.
+        deadline: Seconds after which the calls still running are cancelled.
+            Default is no deadline.
+
+    Returns:
+        The results and the errors, by key.
+    """
+
+    tasks = {asyncio.ensure_future(call): key for key, call in calls.items()}
+    result = BulkResult()
+    if not tasks:
+        return result
+
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+    finally:
+        for task in tasks:
+            task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+    for task, key in tasks.items():
+        if task.cancelled():
+            result.errors[key] = asyncio.TimeoutError(
+                f"Not completed within the deadline of {deadline} s"
+            )
+        elif task.exception() is not None:
+            result.errors[key] = task.exception()
+        else:
+            result.results[key] = task.result()
+    return result
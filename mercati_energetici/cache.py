@@ -0,0 +1,305 @@
+"""Caches for the GME APP API responses"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from .codec import decode_payload, encode_payload
+
+
+@dataclass
+class CacheEntry:
+    """A cached response and the time (seconds since the epoch) it was stored."""
+
+    value: Any
+    created: float
+
+
+class _KeyLocks:
+    """Per-key asyncio locks, discarded when no task is using them."""
+
+    def __init__(self) -> None:
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def __call__(self, key: str) -> AsyncIterator[None]:
+        lock, users = self._locks.get(key, (asyncio.Lock(), 0))
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+
+class Cache(ABC):
+    """
+    Base class for the caches of the GME APP API responses.
+    Keys are request URIs and values are the decoded JSON responses.
+    Cached values are shared between callers and must not be modified.
+
+    Entries younger than ``ttl`` are fresh. Entries older than that, but younger
+    than ``ttl + max_stale``, are stale: they are served immediately while a
+    refresh runs in the background (stale-while-revalidate). Older entries are
+    expired and are fetched again before being served.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_stale: float = 0.0) -> None:
+        """Create the cache.
+
+        Args:
+            ttl: Seconds after which a cached response is fetched again.
+            max_stale: Seconds after the TTL during which a stale response is
+                served while it is refreshed in the background. Default is 0,
+                meaning stale responses are never served.
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+    @abstractmethod
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get a cached response.
+
+        Args:
+            key: The request URI.
+
+        Returns:
+            The cache entry, or ``None`` if the key is not cached.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store a response.
+
+        Args:
+            key: The request URI.
+            value: The decoded JSON response.
+        """
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """Serialize the fetches of the same key, so that concurrent requests
+        for a missing key result in a single request to the GME API.
+
+        Args:
+            key: The request URI.
+        """
+        yield
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check if a cache entry can be served without fetching it again.
+
+        Args:
+            entry: The cache entry.
+
+        Returns:
+            ``True`` if the entry is younger than the TTL.
+        """
+        return time.time() - entry.created < self.ttl
+
+    def is_servable(self, entry: CacheEntry) -> bool:
+        """Check if a cache entry can be served, fresh or stale.
+
+        Args:
+            entry: The cache entry.
+
+        Returns:
+            ``True`` if the entry has not reached the hard expiry, ``ttl + max_stale``.
+        """
+        return time.time() - entry.created < self.ttl + self.max_stale
+
+    async def close(self) -> None:
+        """Release the resources held by the cache."""
+
+
+class MemoryCache(Cache):
+    """In-process LRU cache."""
+
+    def __init__(
+        self, ttl: float = 300.0, max_stale: float = 0.0, max_entries: int = 1024
+    ) -> None:
+        """Create the cache.
+
+        Args:
+            ttl: Seconds after which a cached response is fetched again.
+            max_stale: Seconds after the TTL during which a stale response is
+                served while it is refreshed in the background.
+            max_entries: Maximum number of cached responses. The least recently
+                used ones are evicted first.
+        """
+        super().__init__(ttl, max_stale)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._locks = _KeyLocks()
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = CacheEntry(value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        async with self._locks(key):
+            yield
+
+
+class SQLiteCache(Cache):
+    """
+    Cache stored in a SQLite database in WAL mode, shared by all the processes
+    on the same host (e.g. the workers of a web server) using the same file.
+    A fetch lock stored in the database ensures that only one process requests
+    a key to the GME API, while the others wait for the result.
+    Responses are stored compressed with ``codec.encode_payload``. Expired
+    entries, and the oldest ones beyond ``max_entries``, are deleted when a
+    response is stored.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 300.0,
+        max_stale: float = 0.0,
+        lock_timeout: float = 30.0,
+        poll_interval: float = 0.05,
+        busy_timeout: float = 5.0,
+        max_entries: int = 100_000,
+    ) -> None:
+        """Create the cache, and the database if it does not exist.
+
+        Args:
+            path: Path of the SQLite database file.
+            ttl: Seconds after which a cached response is fetched again.
+            max_stale: Seconds after the TTL during which a stale response is
+                served while it is refreshed in the background.
+            lock_timeout: Seconds after which a fetch lock is considered
+                abandoned (e.g. by a crashed process) and can be taken over.
+            poll_interval: Seconds between attempts to take a fetch lock held
+                by another process.
+            busy_timeout: Seconds a query waits for the database to be unlocked
+                by another process before failing.
+            max_entries: Maximum number of cached responses. The oldest ones
+                are evicted first.
+        """
+        super().__init__(ttl, max_stale)
+        self.path = path
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.max_entries = max_entries
+        self._locks = _KeyLocks()
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_created ON entries (created)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, expires REAL NOT NULL)"
+        )
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self._db_lock:
+            return self._db.execute(sql, parameters).fetchall()
+
+    async def get(self, key: str) -> CacheEntry | None:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT value, created FROM entries WHERE key = ?", (key,)
+        )
+        if not rows:
+            return None
+        value, created = rows[0]
+        return CacheEntry(decode_payload(value), created)
+
+    def _store(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, created) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, now),
+                )
+                self._db.execute(
+                    "DELETE FROM entries WHERE created < ?",
+                    (now - self.ttl - self.max_stale,),
+                )
+                self._db.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                    "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            finally:
+                self._db.execute("COMMIT")
+
+    async def set(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self._store, key, encode_payload(value))
+
+    def _try_acquire(self, key: str) -> float | None:
+        """Take the fetch lock of a key, if free or abandoned.
+
+        Returns:
+            The expiry time written, identifying this owner of the lock, or
+            ``None`` if the lock is held by another process.
+        """
+        now = time.time()
+        expires = now + self.lock_timeout
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "DELETE FROM locks WHERE key = ? AND expires < ?", (key, now)
+                )
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO locks (key, expires) VALUES (?, ?)",
+                    (key, expires),
+                )
+                acquired = cursor.rowcount == 1
+            finally:
+                self._db.execute("COMMIT")
+        return expires if acquired else None
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        # Tasks of this process queue on an asyncio lock, so only one of them
+        # polls the database
+        async with self._locks(key):
+            while (expires := await asyncio.to_thread(self._try_acquire, key)) is None:
+                await asyncio.sleep(self.poll_interval)
+            try:
+                yield
+            finally:
+                # If the fetch outlived the lock, another process may own it now
+                await asyncio.to_thread(
+                    self._execute,
+                    "DELETE FROM locks WHERE key = ? AND expires = ?",
+                    (key, expires),
+                )
+
+    async def close(self) -> None:
+        with self._db_lock:
+            self._db.close()
@@ -0,0 +1,164 @@
+"""Change detection for revised market results"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+# Fields identifying a record, as opposed to its values
+KEY_FIELDS = (
+    "data",
+    "dataFlusso",
+    "ora",
+    "periodo",
+    "mercato",
+    "zona",
+    "prodotto",
+    "tipologia",
+    "impresaStoccaggio",
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _digest(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class Changes:
+    """Row-level differences between two versions of a response.
+
+    Attributes:
+        uri: The request URI, identifying endpoint, market and date.
+        added: Records not present in the previous version.
+        changed: Records whose values differ from the previous version.
+        removed: Keys of the records no longer present, as tuples of
+            ``(field, value)`` pairs.
+        replaced: Whether the records could not be matched by their key
+            fields, because several records share the same key. In this case
+            ``added`` holds the whole new response, which replaces the previous
+            one.
+    """
+
+    uri: str
+    added: list[dict] = field(default_factory=list)
+    changed: list[dict] = field(default_factory=list)
+    removed: list[tuple] = field(default_factory=list)
+    replaced: bool = False
+
+
+class ChangeTracker:
+    """
+    Detects revisions of the responses fetched from the GME API.
+
+    A content hash of every response is kept per request URI (that is, per
+    endpoint, market and date), together with a hash per record. When a response
+    fetched again has a different content hash, the records are compared by their
+    key fields (like "data", "ora", "mercato" and "zona") and the differences are
+    passed to the callback. The first response of every URI sets the baseline
+    and is not reported.
+
+    Errors of the callback are logged and don't fail the request: the new
+    version becomes the baseline only after the callback succeeds, so the same
+    changes are reported again on the next fetch.
+
+    Baselines are kept in the memory of the process, for the ``max_entries``
+    most recently fetched URIs. Revisions are therefore not detected for URIs
+    fetched before a restart or evicted (their next response becomes the new
+    baseline), nor for responses fetched by other processes sharing a
+    ``SQLiteCache``: use one tracker in the process that fetches the data.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Changes], Awaitable[None] | None],
+        key_fields: tuple[str, ...] = KEY_FIELDS,
+        max_entries: int = 10_000,
+    ) -> None:
+        """Create the tracker.
+
+        Args:
+            callback: Function (or coroutine function) receiving the changes.
+            key_fields: Fields identifying a record. Only the ones present in a
+                record are used.
+            max_entries: Maximum number of URIs tracked. The least recently
+                fetched ones are evicted first.
+        """
+        self.callback = callback
+        self.key_fields = key_fields
+        self.max_entries = max_entries
+        # Content hash and hashes of the records by key (None if keys are not
+        # unique) of the last version of each URI
+        self._baselines: OrderedDict[
+            str, tuple[str, dict[tuple, str] | None]
+        ] = OrderedDict()
+
+    def _set_baseline(
+        self, uri: str, digest: str, hashes: dict[tuple, str] | None
+    ) -> None:
+        self._baselines[uri] = (digest, hashes)
+        self._baselines.move_to_end(uri)
+        while len(self._baselines) > self.max_entries:
+            self._baselines.popitem(last=False)
+
+    def _row_key(self, record: Any) -> tuple:
+        if not isinstance(record, dict):
+            return ()
+        return tuple((key, record[key]) for key in self.key_fields if key in record)
+
+    async def observe(self, uri: str, data: Any) -> Changes | None:
+        """Compare a fetched response with the previous one for the same URI.
+
+        Args:
+            uri: The request URI.
+            data: The decoded JSON response.
+
+        Returns:
+            The changes, or ``None`` if there is no previous version, the
+            content did not change or the callback failed.
+        """
+
+        digest = _digest(data)
+        baseline = self._baselines.get(uri)
+        if baseline is not None:
+            self._baselines.move_to_end(uri)
+            if baseline[0] == digest:
+                return None
+
+        records = data if isinstance(data, list) else [data]
+        rows = {self._row_key(record): record for record in records}
+        hashes = None
+        if len(rows) == len(records):
+            hashes = {key: _digest(record) for key, record in rows.items()}
+        if baseline is None:
+            self._set_baseline(uri, digest, hashes)
+            return None
+
+        old_hashes = baseline[1]
+        changes = Changes(uri)
+        if hashes is None or old_hashes is None:
+            changes.added = records
+            changes.replaced = True
+        else:
+            for key, record in rows.items():
+                if key not in old_hashes:
+                    changes.added.append(record)
+                elif old_hashes[key] != hashes[key]:
+                    changes.changed.append(record)
+            changes.removed = [key for key in old_hashes if key not in hashes]
+
+        try:
+            result = self.callback(changes)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Failed to report the changes of %s", uri)
+            return None
+        self._set_baseline(uri, digest, hashes)
+        return changes
@@ -0,0 +1,106 @@
+"""Unified client for all the GME markets"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Any, Callable, Sequence
+
+from .dataset import get_daily_dataset
+from .electricity_markets import MercatiElettrici, MGP
+from .energy_markets import MercatiEnergetici
+from .environmental_markets import MercatiAmbientali
+from .gas_markets import MercatiGas
+from .warmup import WarmupProgress, WarmupSpec, warm_up
+
+
+@dataclass
+class GME(MercatiEnergetici):
+    """
+    Client for all the GME markets.
+    The electricity, gas and environmental APIs are exposed as sub-namespaces
+    sharing the same transport (and connection pool), cache and limiter, with a
+    single lifecycle: the sub-namespaces never close the shared transport.
+
+    Attributes:
+        elettrici: The ``MercatiElettrici`` API.
+        mgp: The ``MGP`` API.
+        gas: The ``MercatiGas`` API.
+        ambientali: The ``MercatiAmbientali`` API.
+    """
+
+    def __post_init__(self) -> None:
+        """Create the sub-namespaces over the shared resources."""
+        super().__post_init__()
+        shared = {field.name: getattr(self, field.name) for field in fields(self)}
+        self.elettrici = MercatiElettrici(**shared)
+        self.mgp = MGP(**shared)
+        self.gas = MercatiGas(**shared)
+        self.ambientali = MercatiAmbientali(**shared)
+
+    async def __aenter__(self) -> GME:
+        """Async enter.
+
+        Returns:
+            The GME object.
+        """
+        return self
+
+    async def warm_up(
+        self,
+        specs: list[WarmupSpec],
+        concurrency: int = 8,
+        progress: Callable[[WarmupProgress], None] | None = None,
+        deadline: float | None = None,
+    ) -> WarmupProgress:
+        """Pre-populate the cache with the data described by the specs.
+        To warm up in the background at startup, wrap it in a task:
+        ``asyncio.create_task(gme.warm_up(specs))``.
+
+        Args:
+            specs: The data to pre-fetch.
+            concurrency: Maximum number of concurrent requests.
+            progress: Function called with the progress after every request.
+            deadline: Seconds after which the warm-up stops. Requests not
+                completed are recorded as failed. Default is no deadline.
+
+        Returns:
+            The final progress, with the failed requests.
+        """
+        return await warm_up(self, specs, concurrency, progress, deadline)
+
+    async def get_daily_dataset(
+        self,
+        start: date,
+        end: date,
+        gas_products: Sequence[str] = ("MGP",),
+        environmental_markets: Sequence[str] = ("GO", "TEE"),
+        deadline: float | None = None,
+        concurrency: int = 8,
+    ) -> dict[str, Any]:
+        """Get a date-aligned dataset of the PUN, gas auction prices and
+        environmental prices. The requests are sent concurrently, up to
+        ``concurrency`` at a time.
+
+        Args:
+            start: First day of the dataset.
+            end: Last day of the dataset.
+            gas_products: Gas auction products, one of ["MGP", "MI"], priced on
+                their delivery day.
+            environmental_markets: Environmental markets, like "GO" or "TEE",
+                priced with the volume-weighted reference price of the day.
+            deadline: Seconds after which the requests still running are
+                cancelled. Default is no deadline.
+            concurrency: Maximum number of concurrent requests.
+
+        Returns:
+            A Python dictionary of columns like: ``{"date": [date, ...],
+                                                    "pun": array('d', [...]),
+                                                    "gas_MGP": array('d', [...]),
+                                                    "GO": array('d', [...]),
+                                                    "TEE": array('d', [...]),
+                                                    "errors": {(column, day): exception}}``
+            Days without data, failed or not completed by the deadline are NaN.
+        """
+        return await get_daily_dataset(
+            self, start, end, gas_products, environmental_markets, deadline, concurrency
+        )
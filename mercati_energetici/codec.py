@@ -0,0 +1,86 @@
+"""Compact encoding of the GME APP API payloads for storage"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any
+
+# Formats, identified by the first byte of the encoded payload
+_ZLIB = b"z"
+_COLUMNAR_ZLIB = b"c"
+
+# Preset dictionary of strings frequent in the payloads, which improves the
+# compression of small payloads
+_ZDICT = json.dumps(
+    [
+        ["data", "ora", "mercato", "zona", "prezzo", "acquisti", "vendite"],
+        ["liquidita", "prodotto", "volumi", "volumiMw", "volumiMwh", "tipo"],
+        ["primoPrezzo", "ultimoPrezzo", "prezzoMinimo", "prezzoMassimo"],
+        ["prezzoMedio", "prezzoControllo", "acquistiTso", "venditeTso"],
+        ["dataFlusso", "impresaStoccaggio", "tipologia", "acquistiSrg"],
+        ["venditeSrg", "periodo", "prezzoRiferimento", "Stogit", "GO", "TEE"],
+        ["CALA", "CNOR", "CSUD", "NORD", "PUN", "SARD", "SICI", "SUD", "Totale"],
+        ["MGP", "MI-A1", "MI-A2", "MI-A3", "XBID", "MI", "MGS", "null"],
+    ],
+    separators=(",", ":"),
+).encode("utf-8")
+
+
+def _columnar(value: Any) -> list | None:
+    """Convert a list of records with the same keys to columns, if possible."""
+    if not isinstance(value, list) or not value:
+        return None
+    if not all(isinstance(record, dict) for record in value):
+        return None
+    keys = list(value[0])
+    if any(list(record) != keys for record in value):
+        return None
+    return [keys, [list(record.values()) for record in value]]
+
+
+def encode_payload(value: Any, level: int = 6) -> bytes:
+    """Encode a decoded JSON payload in a compact binary form.
+
+    Lists of records sharing the same keys, like most GME payloads, are stored
+    in a columnar layout with the keys written once, then compressed with zlib
+    and a preset dictionary of the frequent GME strings.
+
+    Args:
+        value: The decoded JSON payload.
+        level: zlib compression level, from 1 (fastest) to 9 (smallest).
+
+    Returns:
+        The encoded payload.
+    """
+
+    compressor = zlib.compressobj(level, zdict=_ZDICT)
+    columns = _columnar(value)
+    if columns is not None:
+        header, value = _COLUMNAR_ZLIB, columns
+    else:
+        header = _ZLIB
+    text = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return header + compressor.compress(text) + compressor.flush()
+
+
+def decode_payload(data: bytes) -> Any:
+    """Decode a payload encoded by ``encode_payload``.
+
+    Plain JSON, as stored by previous versions, is decoded as well.
+
+    Args:
+        data: The encoded payload.
+
+    Returns:
+        The decoded JSON payload.
+    """
+
+    header, body = data[:1], data[1:]
+    if header not in (_ZLIB, _COLUMNAR_ZLIB):
+        return json.loads(data)
+    decompressor = zlib.decompressobj(zdict=_ZDICT)
+    value = json.loads(decompressor.decompress(body) + decompressor.flush())
+    if header == _COLUMNAR_ZLIB:
+        keys, rows = value
+        return [dict(zip(keys, row)) for row in rows]
+    return value
@@ -0,0 +1,124 @@
+"""Cross-commodity daily dataset"""
+from __future__ import annotations
+
+import asyncio
+from array import array
+from datetime import date, timedelta
+from functools import partial
+from typing import Any, Awaitable, Callable, Sequence
+
+from .bulk import gather_with_deadline
+from .exceptions import MercatiEnergeticiNoDataError, MercatiEnergeticiZoneError
+
+# Days between the auction and the delivery of the gas products
+GAS_PRODUCT_LEAD = {"MGP": 1, "MI": 0}
+
+NAN = float("nan")
+
+
+def _weighted_price(results: list[dict]) -> float:
+    """Volume-weighted reference price of the environmental market results."""
+    volume = sum(result["volumi"] or 0 for result in results)
+    if not volume:
+        return NAN
+    return (
+        sum(
+            (result["prezzoRiferimento"] or 0) * (result["volumi"] or 0)
+            for result in results
+        )
+        / volume
+    )
+
+
+async def get_daily_dataset(
+    gme: Any,
+    start: date,
+    end: date,
+    gas_products: Sequence[str] = ("MGP",),
+    environmental_markets: Sequence[str] = ("GO", "TEE"),
+    deadline: float | None = None,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """Get a date-aligned dataset of power, gas and environmental prices.
+
+    The requests are sent concurrently, up to ``concurrency`` at a time. Each column holds one value per day
+    from ``start`` to ``end`` (included). Days without data are NaN, as well as
+    days whose request failed (e.g. for an unknown market) or did not complete
+    by the deadline: their errors are listed under the "errors" key.
+
+    Args:
+        gme: A ``GME`` client.
+        start: First day of the dataset.
+        end: Last day of the dataset.
+        gas_products: Gas auction products, one of ["MGP", "MI"]. The price of
+            each day is the auction price of the product delivered on that day.
+        environmental_markets: Environmental markets, like "GO" or "TEE". The
+            price of each day is the volume-weighted reference price of the
+            sessions held on that day.
+        deadline: Seconds after which the requests still running are cancelled.
+            Default is no deadline.
+        concurrency: Maximum number of concurrent requests.
+
+    Returns:
+        A Python dictionary of columns like: ``{"date": [date, ...],
+                                                "pun": array('d', [...]),
+                                                "gas_MGP": array('d', [...]),
+                                                "GO": array('d', [...]),
+                                                "TEE": array('d', [...]),
+                                                "errors": {(column, day): exception}}``
+    """
+
+    for product in gas_products:
+        if product not in GAS_PRODUCT_LEAD:
+            raise ValueError(
+                f"Gas product '{product}' not supported. "
+                f"Available products are: {list(GAS_PRODUCT_LEAD)}"
+            )
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+    async def gas_price(product: str, day: date) -> float:
+        results = await gme.gas.get_auction_trading_results(
+            f"{product}-{day.isoformat()}",
+            day - timedelta(days=GAS_PRODUCT_LEAD[product]),
+        )
+        price = results[0]["prezzo"] if results else None
+        return NAN if price is None else price
+
+    async def environmental_price(market: str, day: date) -> float:
+        return _weighted_price(await gme.ambientali.get_trading_results(market, day))
+
+    requests: dict[str, Callable[[date], Awaitable[float]]] = {"pun": gme.mgp.daily_pun}
+    for product in gas_products:
+        requests[f"gas_{product}"] = partial(gas_price, product)
+    for market in environmental_markets:
+        requests[market] = partial(environmental_price, market)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(request: Callable[[date], Awaitable[float]], day: date) -> float:
+        async with semaphore:
+            return await request(day)
+
+    result = await gather_with_deadline(
+        {
+            (column, day): limited(request, day)
+            for column, request in requests.items()
+            for day in days
+        },
+        deadline,
+    )
+
+    dataset: dict[str, Any] = {"date": days}
+    for column in requests:
+        dataset[column] = array(
+            "d", (result.results.get((column, day), NAN) for day in days)
+        )
+    # Data not published is missing by design, not an error
+    dataset["errors"] = {
+        key: error
+        for key, error in result.errors.items()
+        if not isinstance(
+            error, (MercatiEnergeticiNoDataError, MercatiEnergeticiZoneError)
+        )
+    }
+    return dataset
@@ -1,9 +1,11 @@
 """Electricity Markets"""
 from __future__ import annotations
-from datetime import date
+from datetime import date, datetime
 
 from .energy_markets import MercatiEnergetici
+from .profiling import profiled
 from .exceptions import MercatiEnergeticiZoneError
+from .timeseries import TimeSeries
 
 
 class MercatiElettrici(MercatiEnergetici):
@@ -13,6 +15,7 @@ class MercatiElettrici(MercatiEnergetici):
     for an explanation of the markets.
     """
 
+    @profiled
     async def get_markets(self) -> dict:
         """Get electricity markets.
 
@@ -25,6 +28,7 @@ class MercatiElettrici(MercatiEnergetici):
         data = await self._request("/GetMercatiElettrici")
         return data
 
+    @profiled
     async def get_prices(self, market: str, day: date | str = None) -> list[dict]:
         """Get electricity prices in €/MWh for a specific day on all the market zones.
 
@@ -48,6 +52,7 @@ class MercatiElettrici(MercatiEnergetici):
         )
         return data
 
+    @profiled
     async def get_volumes(self, market: str, day: date | str = None) -> list[dict]:
         """Get bought and sold volume for a specific day on all the market zones.
 
@@ -72,6 +77,7 @@ class MercatiElettrici(MercatiEnergetici):
         )
         return data
 
+    @profiled
     async def get_liquidity(self, day: date | str = None) -> dict:
         """Get liquidity of electricity markets.
 
@@ -98,6 +104,26 @@ class MGP(MercatiElettrici):
     Hours are in [0 -> 23].
     """
 
+    @profiled
+    async def get_zonal_prices(self, day: date | str = None) -> dict[str, dict]:
+        """Get electricity prices in €/MWh for a specific day on all the zones.
+
+        Args:
+            day: Get prices of this date. Default is today. A string in the format
+                    "YYYYMMDD" or a ``datetime.date`` object.
+
+        Returns:
+            A Python dictionary like: ``{ zone : { hour : price_per_MWh } }``
+        """
+
+        data = await super().get_prices("MGP", day)
+        with self._stage("transform"):
+            prices = {record["zona"]: {} for record in data if "zona" in record}
+            for record in data:
+                prices[record["zona"]][record["ora"] - 1] = record["prezzo"]
+        return prices
+
+    @profiled
     async def get_prices(self, day: date | str = None, zone: str = "PUN") -> dict:
         """Get electricity prices in €/MWh for a specific day and zone.
 
@@ -111,16 +137,14 @@ class MGP(MercatiElettrici):
             A Python dictionary like: ``{ hour : price_per_MWh }``
         """
 
-        data = await super().get_prices("MGP", day)
-        prices = {record["zona"]: {} for record in data if "zona" in record}
-        for record in data:
-            prices[record["zona"]][record["ora"] - 1] = record["prezzo"]
+        prices = await self.get_zonal_prices(day)
         if zone not in prices.keys():
             raise MercatiEnergeticiZoneError(
                 f"Zone '{zone}' not found. Available zones are: {list(prices.keys())}"
             )
         return prices[zone]
 
+    @profiled
     async def daily_pun(self, day: date | str = None) -> float:
         """Get the PUN price for a specific day.
 
@@ -135,6 +159,34 @@ class MGP(MercatiElettrici):
         hourly_pun = list(prices.values())
         return sum(hourly_pun) / len(hourly_pun)
 
+    @profiled
+    async def get_zonal_volumes(
+        self, day: date | str = None
+    ) -> tuple[dict[str, dict], dict[str, dict]]:
+        """Get bought and sold volume for a specific day on all the zones.
+
+        Args:
+            day: Get volumes of this date. Default is today. A string in the format
+                    "YYYYMMDD" or a ``datetime.date`` object.
+
+        Returns:
+            Two Python dictionaries like: ``{ zone : { hour : MWh } }``
+        """
+
+        data = await super().get_volumes("MGP", day)
+        with self._stage("transform"):
+            bought, sold = {}, {}
+            for record in data:
+                if "zona" not in record:
+                    continue
+                zone, hour = record["zona"], record["ora"] - 1
+                if zone not in bought:
+                    bought[zone], sold[zone] = {}, {}
+                bought[zone][hour] = record["acquisti"]
+                sold[zone][hour] = record["vendite"]
+        return bought, sold
+
+    @profiled
     async def get_volumes(
         self, day: date | str = None, zone: str = "Totale"
     ) -> tuple[dict, dict]:
@@ -150,18 +202,14 @@ class MGP(MercatiElettrici):
             Two Python dictionaries like: ``{ hour : MWh }``
         """
 
-        data = await super().get_volumes("MGP", day)
-        bought = {record["zona"]: {} for record in data if "zona" in record}
-        sold = bought.copy()
-        for record in data:
-            bought[record["zona"]][record["ora"] - 1] = record["acquisti"]
-            sold[record["zona"]][record["ora"] - 1] = record["vendite"]
+        bought, sold = await self.get_zonal_volumes(day)
         if zone not in bought.keys():
             raise MercatiEnergeticiZoneError(
                 f"Zone '{zone}' not found. Available zones are: {list(bought.keys())}"
             )
         return bought[zone], sold[zone]
 
+    @profiled
     async def get_liquidity(self, day: date | str = None) -> dict:
         """Get liquidity of electricity markets.
 
@@ -173,5 +221,89 @@ class MGP(MercatiElettrici):
             A Python dictionary like: ``{hour: liquidity}``.
         """
         data = await super().get_liquidity(day)
-        liquidity = {x["ora"] - 1: x["liquidita"] for x in data}
+        with self._stage("transform"):
+            liquidity = {x["ora"] - 1: x["liquidita"] for x in data}
         return liquidity
+
+    @profiled
+    async def get_price_series(
+        self, day: date | str = None, zone: str = "PUN"
+    ) -> TimeSeries:
+        """Get electricity prices in €/MWh for a specific day and zone as a time series.
+        Unlike ``get_prices``, the series is sized from the actual number of
+        periods of the day and supports sub-hourly resolutions.
+
+        Args:
+            day: Get prices of this date. Default is today. A string in the format
+                    "YYYYMMDD" or a ``datetime.date`` object.
+            zone: One of ["CALA","CNOR","CSUD","NORD","PUN","SARD","SICI","SUD"].
+                  Default is "PUN" (whole Italy).
+
+        Returns:
+            A ``TimeSeries`` of prices.
+        """
+
+        day = datetime.strptime(self._handle_date(day), "%Y%m%d").date()
+        data = await super().get_prices("MGP", day)
+        self._check_zone(data, zone)
+        with self._stage("transform"):
+            return TimeSeries.from_records(day, data, "prezzo", zone)
+
+    @profiled
+    async def get_volume_series(
+        self, day: date | str = None, zone: str = "Totale"
+    ) -> tuple[TimeSeries, TimeSeries]:
+        """Get bought and sold volume in MWh for a specific day and zone as time series.
+
+        Args:
+            day: Get volumes of this date. Default is today. A string in the format
+                    "YYYYMMDD" or a ``datetime.date`` object.
+            zone: One of ["CALA","CNOR","CSUD","NORD","SARD","SICI","SUD","Totale"].
+                  Default is "Totale" (whole Italy).
+
+        Returns:
+            Two ``TimeSeries``, of bought and sold volumes.
+        """
+
+        day = datetime.strptime(self._handle_date(day), "%Y%m%d").date()
+        data = await super().get_volumes("MGP", day)
+        self._check_zone(data, zone)
+        with self._stage("transform"):
+            return (
+                TimeSeries.from_records(day, data, "acquisti", zone),
+                TimeSeries.from_records(day, data, "vendite", zone),
+            )
+
+    @profiled
+    async def get_liquidity_series(self, day: date | str = None) -> TimeSeries:
+        """Get liquidity of electricity markets as a time series.
+
+        Args:
+            day: Get liquidity of this date. Default is today. A string in the format
+                    "YYYYMMDD" or a ``datetime.date`` object.
+
+        Returns:
+            A ``TimeSeries`` of liquidity percentages.
+        """
+
+        day = datetime.strptime(self._handle_date(day), "%Y%m%d").date()
+        data = await super().get_liquidity(day)
+        with self._stage("transform"):
+            return TimeSeries.from_records(day, data, "liquidita")
+
+    @staticmethod
+    def _check_zone(data: list[dict], zone: str) -> None:
+        """Check that a zone is present in the records served by the GME API.
+
+        Args:
+            data: The records.
+            zone: The zone.
+        """
+
+        zones = list(
+            dict.fromkeys(record["zona"] for record in data if "zona" in record)
+        )
+        if zone not in zones:
+            raise MercatiEnergeticiZoneError(
+                f"Zone '{zone}' not found. Available zones are: {zones}"
+            )
@@ -1,25 +1,75 @@
 """MercatiEnergetici base class"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Any
+from typing import Any, ContextManager
 
 from aiohttp import ClientSession
 from yarl import URL
 
+from .breaker import CircuitBreaker
 from .exceptions import (
     MercatiEnergeticiError,
+    MercatiEnergeticiCircuitOpenError,
     MercatiEnergeticiConnectionError,
+    MercatiEnergeticiNoDataError,
     MercatiEnergeticiRequestError,
 )
+from .cache import Cache
+from .changes import ChangeTracker
+from .hedging import HedgePolicy
+from .profiling import Profiler, profiled
+from .transports import AiohttpTransport, Transport
+
+_LOGGER = logging.getLogger(__name__)
+
+GME_APP_HOST = "app.mercatienergetici.org"
 
 
 @dataclass
 class MercatiEnergetici:
-    """Base class for handling connections with the GME APP API."""
+    """Base class for handling connections with the GME APP API.
+
+    Args:
+        session: An ``aiohttp.ClientSession`` to use with the default transport.
+        transport: The HTTP transport to use. Default is an ``AiohttpTransport``,
+            closed together with this object. A transport passed explicitly is
+            owned by the caller and is not closed.
+        cache: A cache for the responses of the GME API. Default is no cache.
+        limiter: A semaphore limiting the number of concurrent requests to the
+            GME API. Default is no limit.
+        breaker: A circuit breaker failing fast during GME outages, serving
+            cached responses when available. Default is no circuit breaker.
+        hedging: A policy for sending a duplicate of slow requests and using
+            the first response. Default is no hedging.
+        profiler: A profiler recording the time spent in each stage of the
+            requests. Default is no profiling.
+        change_tracker: A tracker reporting the records revised by GME when a
+            response is fetched again. Default is no change detection.
+    """
 
     session: ClientSession | None = None
+    transport: Transport | None = None
+    cache: Cache | None = None
+    limiter: asyncio.Semaphore | None = None
+    breaker: CircuitBreaker | None = None
+    hedging: HedgePolicy | None = None
+    profiler: Profiler | None = None
+    change_tracker: ChangeTracker | None = None
+    _refreshing: dict[str, asyncio.Task] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        """Create the default transport if none was provided."""
+        self.close_session = self.transport is None
+        if self.transport is None:
+            self.transport = AiohttpTransport(self.session)
 
     async def _request(
         self,
@@ -46,19 +96,201 @@ class MercatiEnergetici:
                 variables used in the request.
         """
 
-        gme_app_host = "app.mercatienergetici.org"
-        url = URL.build(scheme="https", host=gme_app_host)
-        url = url.join(URL(uri))
+        if self.cache is None:
+            return await self._fetch(uri)
+
+        entry = await self.cache.get(uri)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.value
+        if entry is not None and self.cache.is_servable(entry):
+            self._revalidate(uri)
+            return entry.value
+
+        try:
+            return await self._refresh(uri)
+        except MercatiEnergeticiCircuitOpenError:
+            # During outages, an expired response is better than none
+            if entry is None:
+                raise
+            return entry.value
+
+    async def _refresh(self, uri: str) -> Any:
+        """Fetch a response and store it in the cache, unless another request
+        refreshed it in the meantime.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+
+        Returns:
+            The decoded JSON response.
+        """
+
+        async with self.cache.lock(uri):
+            # Another request may have fetched it while waiting for the lock
+            entry = await self.cache.get(uri)
+            if entry is not None and self.cache.is_fresh(entry):
+                return entry.value
+            data = await self._fetch(uri)
+            await self.cache.set(uri, data)
+            return data
+
+    def _revalidate(self, uri: str) -> None:
+        """Refresh a stale cache entry in the background.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+        """
 
-        if self.session is None:
-            self.session = ClientSession()
-            self.close_session = True
+        if uri in self._refreshing:
+            return
+
+        async def revalidate() -> None:
+            try:
+                await self._refresh(uri)
+            except MercatiEnergeticiError as exception:
+                _LOGGER.warning("Failed to refresh %s: %s", uri, exception)
+            except Exception:  # pylint: disable=broad-except
+                # Nobody awaits this task: log instead of losing the error
+                _LOGGER.exception("Unexpected error while refreshing %s", uri)
+
+        # Run in an empty context, so that the profiler doesn't attribute the
+        # refresh to the public method that triggered it
+        task = contextvars.Context().run(asyncio.ensure_future, revalidate())
+        # Also called for tasks cancelled before they start
+        task.add_done_callback(lambda _: self._refreshing.pop(uri, None))
+        self._refreshing[uri] = task
+
+    async def _fetch(self, uri: str) -> Any:
+        """Fetch a response from the GME APP API, respecting the limiter and
+        the circuit breaker, and detect its changes.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+
+        Returns:
+            The decoded JSON response.
+        """
+
+        if self.limiter is None:
+            data = await self._guarded_send(uri)
+        else:
+            async with self.limiter:
+                data = await self._guarded_send(uri)
+
+        if self.change_tracker is not None:
+            await self.change_tracker.observe(uri, data)
+        return data
+
+    async def _guarded_send(self, uri: str) -> Any:
+        """Send a request through the circuit breaker, if any.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+
+        Returns:
+            The decoded JSON response.
+        """
+
+        if self.breaker is None:
+            return await self._hedged_send(uri)
+
+        self.breaker.before_request(GME_APP_HOST)
+        try:
+            data = await self._hedged_send(uri)
+        except MercatiEnergeticiConnectionError:
+            self.breaker.record_failure(GME_APP_HOST)
+            raise
+        except MercatiEnergeticiError:
+            # The API answered, even if with an error
+            self.breaker.record_success(GME_APP_HOST)
+            raise
+        except BaseException:
+            self.breaker.record_cancelled(GME_APP_HOST)
+            raise
+        self.breaker.record_success(GME_APP_HOST)
+        return data
 
-        response = await self.session.request(
-            "GET",
+    async def _hedged_send(self, uri: str) -> Any:
+        """Send a request, hedging it with a duplicate if it is slow.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+
+        Returns:
+            The decoded JSON response of the first request to succeed.
+        """
+
+        if self.hedging is None:
+            return await self._send(uri)
+
+        start = time.monotonic()
+        tasks = {asyncio.ensure_future(self._send(uri))}
+        try:
+            delay = self.hedging.delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.hedging.can_hedge():
+                    hedge = await self._start_hedge(uri)
+                    if hedge is not None:
+                        tasks.add(hedge)
+            self.hedging.record_request(len(tasks) > 1)
+
+            while True:
+                done, pending = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    # The latency of the request as a whole, so that a slow
+                    # request beaten by its hedge is still accounted for
+                    self.hedging.record_latency(time.monotonic() - start)
+                    return succeeded[0].result()
+                if not pending:
+                    # All the requests failed: raise the last error
+                    return next(iter(done)).result()
+                tasks = pending
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _start_hedge(self, uri: str) -> asyncio.Task | None:
+        """Send the duplicate of a slow request, in a free slot of the limiter.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+
+        Returns:
+            The task of the duplicate request, or ``None`` if the limiter has
+            no free slot.
+        """
+
+        if self.limiter is None:
+            return asyncio.ensure_future(self._send(uri))
+        if self.limiter.locked():
+            return None
+        # A free slot is acquired without waiting
+        await self.limiter.acquire()
+        task = asyncio.ensure_future(self._send(uri))
+        task.add_done_callback(lambda _: self.limiter.release())
+        return task
+
+    async def _send(self, uri: str) -> Any:
+        """Send a request to the GME APP API and decode the response.
+
+        Args:
+            uri: Request URI, for example, '/GetMarkets'
+
+        Returns:
+            The decoded JSON response.
+        """
+
+        url = URL.build(scheme="https", host=GME_APP_HOST)
+        url = url.join(URL(uri))
+
+        response = await self.transport.get(
             url,
             headers={
-                "Host": gme_app_host,
+                "Host": GME_APP_HOST,
                 "x-requested-with": "darcato/mercati-energetici",
             },
         )
@@ -67,24 +299,49 @@ class MercatiEnergetici:
             raise MercatiEnergeticiConnectionError("The GME API is unreachable, ")
 
         if response.status == 404:
-            raise MercatiEnergeticiRequestError("Not Found: " + await response.text())
+            raise MercatiEnergeticiRequestError("Not Found: " + response.text())
 
-        response.raise_for_status()
+        if response.status >= 500:
+            raise MercatiEnergeticiConnectionError(
+                "The GME API failed to handle the request",
+                {"status": response.status, "response": response.text()},
+            )
 
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type:
-            text = await response.text()
+        if response.status >= 400:
             raise MercatiEnergeticiError(
                 "Unexpected response from the GME API",
-                {"Content-Type": content_type, "response": text},
+                {"status": response.status, "response": response.text()},
             )
 
-        data = await response.json()
+        if "application/json" not in response.content_type:
+            raise MercatiEnergeticiError(
+                "Unexpected response from the GME API",
+                {"Content-Type": response.content_type, "response": response.text()},
+            )
+
+        if self.profiler is not None:
+            for stage, seconds in response.timings.items():
+                self.profiler.record(stage, seconds)
+        with self._stage("decode"):
+            data = json.loads(response.body)
         if data is None or not data:
-            raise MercatiEnergeticiRequestError("Requested data not found")
+            raise MercatiEnergeticiNoDataError("Requested data not found")
 
         return data
 
+    def _stage(self, stage: str) -> ContextManager:
+        """Time a stage with the profiler, if any.
+
+        Args:
+            stage: The stage, for example "transform".
+
+        Returns:
+            A context manager timing the stage.
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(stage)
+
     def _handle_date(self, day: date | str) -> str:
         """Check and format a date to the YYYYMMDD format.
 
@@ -107,6 +364,7 @@ class MercatiEnergetici:
             )
         return day.strftime("%Y%m%d")
 
+    @profiled
     async def get_general_conditions(self, language: str = "EN") -> dict:
         """Get general usage conditions.
 
@@ -126,6 +384,7 @@ class MercatiEnergetici:
         )
         return data
 
+    @profiled
     async def get_disclaimer(self, language: str = "EN") -> dict:
         """Get disclaimer.
 
@@ -146,9 +405,14 @@ class MercatiEnergetici:
         return data
 
     async def close(self) -> None:
-        """Close client session."""
-        if self.session and self.close_session:
-            await self.session.close()
+        """Cancel the background refreshes and close the client session, if
+        created by this object."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.close_session:
+            await self.transport.close()
 
     async def __aenter__(self) -> MercatiEnergetici:
         """Async enter.
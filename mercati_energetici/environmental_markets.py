@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import date
 
 from .energy_markets import MercatiEnergetici
+from .profiling import profiled
 
 
 class MercatiAmbientali(MercatiEnergetici):
@@ -12,6 +13,7 @@ class MercatiAmbientali(MercatiEnergetici):
     for an explanation of the markets.
     """
 
+    @profiled
     async def get_markets(self) -> list[dict]:
         """Get environmental markets.
 
@@ -24,6 +26,7 @@ class MercatiAmbientali(MercatiEnergetici):
         data = await self._request("/GetMercatiAmbientali")
         return data
 
+    @profiled
     async def get_trading_results(
         self, market: str, day: date | str = None
     ) -> list[dict]:
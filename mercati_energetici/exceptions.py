@@ -9,9 +9,17 @@ class MercatiEnergeticiConnectionError(MercatiEnergeticiError):
     """GME APP API connection exception."""
 
 
+class MercatiEnergeticiCircuitOpenError(MercatiEnergeticiConnectionError):
+    """GME APP API not contacted because of repeated failures."""
+
+
 class MercatiEnergeticiZoneError(MercatiEnergeticiError):
     """Zone not found exception."""
 
 
 class MercatiEnergeticiRequestError(MercatiEnergeticiError):
     """GME APP API wrong request input variables."""
+
+
+class MercatiEnergeticiNoDataError(MercatiEnergeticiRequestError):
+    """GME APP API returned no data, for example for a day not yet published."""
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import date
 
 from .energy_markets import MercatiEnergetici
+from .profiling import profiled
 
 
 class MercatiGas(MercatiEnergetici):
@@ -12,6 +13,7 @@ class MercatiGas(MercatiEnergetici):
     for an explanation of the markets.
     """
 
+    @profiled
     async def get_markets(self) -> list[dict]:
         """Get gas markets.
 
@@ -25,6 +27,7 @@ class MercatiGas(MercatiEnergetici):
         data = await self._request("/GetMercatiGas")
         return data
 
+    @profiled
     async def get_continuous_trading_results(
         self, product: str, day: date | str = None
     ) -> list[dict]:
@@ -56,6 +59,7 @@ class MercatiGas(MercatiEnergetici):
         )
         return data
 
+    @profiled
     async def get_auction_trading_results(
         self, product: str, day: date | str = None
     ) -> list[dict]:
@@ -84,6 +88,7 @@ class MercatiGas(MercatiEnergetici):
         )
         return data
 
+    @profiled
     async def get_stored_gas_trading_results(
         self, company: str, day: date | str = None
     ) -> list[dict]:
@@ -0,0 +1,211 @@
+"""Caching HTTP gateway to the GME APP API"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import Any
+
+from aiohttp import web
+
+from .breaker import CircuitBreaker
+from .cache import MemoryCache, SQLiteCache
+from .client import GME
+from .exceptions import (
+    MercatiEnergeticiError,
+    MercatiEnergeticiCircuitOpenError,
+    MercatiEnergeticiRequestError,
+    MercatiEnergeticiZoneError,
+)
+
+# Typed application keys are available since aiohttp 3.9
+GME_KEY = web.AppKey("gme", GME) if hasattr(web, "AppKey") else "gme"
+
+# Endpoints of the GME APP API served by the gateway
+ENDPOINTS = frozenset(
+    {
+        "GetCondizioniGenerali",
+        "GetDisclaimer",
+        "GetEsitiAmbiente",
+        "GetEsitiGasAsta",
+        "GetEsitiGasContinuo",
+        "GetEsitiGasMGS",
+        "GetLiquidita",
+        "GetMercatiAmbientali",
+        "GetMercatiElettrici",
+        "GetMercatiGas",
+        "GetPrezziME",
+        "GetQuantitaME",
+    }
+)
+
+
+def _json_response(data: Any) -> web.Response:
+    return web.json_response(
+        data, dumps=lambda data: json.dumps(data, ensure_ascii=False)
+    )
+
+
+@web.middleware
+async def _error_middleware(request: web.Request, handler) -> web.StreamResponse:
+    """Translate the library exceptions to HTTP errors."""
+    try:
+        return await handler(request)
+    except (MercatiEnergeticiZoneError, MercatiEnergeticiRequestError) as exception:
+        raise web.HTTPNotFound(text=str(exception))
+    except MercatiEnergeticiCircuitOpenError as exception:
+        raise web.HTTPServiceUnavailable(text=str(exception))
+    except MercatiEnergeticiError as exception:
+        raise web.HTTPBadGateway(text=str(exception))
+    except (ValueError, TypeError) as exception:
+        raise web.HTTPBadRequest(text=str(exception))
+
+
+async def _passthrough(request: web.Request) -> web.Response:
+    """Serve a GME APP API endpoint, e.g. ``/GetPrezziME/20230323/MGP``."""
+    if request.match_info["endpoint"] not in ENDPOINTS:
+        raise web.HTTPNotFound(text=f"Unknown endpoint: {request.path}")
+    return _json_response(await request.app[GME_KEY]._request(request.path))
+
+
+async def _mgp_prices(request: web.Request) -> web.Response:
+    mgp = request.app[GME_KEY].mgp
+    zone = request.query.get("zone", "PUN")
+    return _json_response(await mgp.get_prices(request.match_info["day"], zone))
+
+
+async def _mgp_zonal_prices(request: web.Request) -> web.Response:
+    mgp = request.app[GME_KEY].mgp
+    return _json_response(await mgp.get_zonal_prices(request.match_info["day"]))
+
+
+async def _mgp_pun(request: web.Request) -> web.Response:
+    mgp = request.app[GME_KEY].mgp
+    return _json_response(await mgp.daily_pun(request.match_info["day"]))
+
+
+async def _mgp_volumes(request: web.Request) -> web.Response:
+    mgp = request.app[GME_KEY].mgp
+    zone = request.query.get("zone", "Totale")
+    bought, sold = await mgp.get_volumes(request.match_info["day"], zone)
+    return _json_response({"bought": bought, "sold": sold})
+
+
+async def _mgp_liquidity(request: web.Request) -> web.Response:
+    mgp = request.app[GME_KEY].mgp
+    return _json_response(await mgp.get_liquidity(request.match_info["day"]))
+
+
+def create_app(gme: GME) -> web.Application:
+    """Create the gateway application.
+
+    The gateway exposes the endpoints of the GME APP API used by this library
+    (see ``ENDPOINTS``, for example ``/GetPrezziME/20230323/MGP`` or
+    ``/GetEsitiGasAsta/20230323/MGP-2023-03-24``) and the ``MGP`` views under
+    ``/mgp/``, all served through a single client, so that its cache, limiter
+    and circuit breaker are shared by every consumer.
+    Hours in the ``MGP`` views are returned as string keys, as in any JSON object.
+
+    Args:
+        gme: The client serving the requests. It is not closed with the
+            application.
+
+    Returns:
+        The ``aiohttp`` application.
+    """
+
+    app = web.Application(middlewares=[_error_middleware])
+    app[GME_KEY] = gme
+    app.router.add_get("/mgp/prices/{day}", _mgp_prices)
+    app.router.add_get("/mgp/zonal-prices/{day}", _mgp_zonal_prices)
+    app.router.add_get("/mgp/pun/{day}", _mgp_pun)
+    app.router.add_get("/mgp/volumes/{day}", _mgp_volumes)
+    app.router.add_get("/mgp/liquidity/{day}", _mgp_liquidity)
+    app.router.add_get(r"/{endpoint:Get[A-Za-z]+}{parameters:(/.*)?}", _passthrough)
+    return app
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument(
+        "--ttl", type=float, default=300.0, help="Seconds responses are fresh."
+    )
+    parser.add_argument(
+        "--max-stale",
+        type=float,
+        default=0.0,
+        help="Seconds stale responses are served while refreshed.",
+    )
+    parser.add_argument(
+        "--cache-path", help="SQLite file to share the cache between gateways."
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=10_000,
+        help="Maximum number of cached responses.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent requests to the GME API.",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.5,
+        help="Fraction of failed requests opening the circuit breaker.",
+    )
+    parser.add_argument(
+        "--recovery-time",
+        type=float,
+        default=30.0,
+        help="Seconds the circuit breaker stays open before probing the GME API.",
+    )
+    return parser
+
+
+def _create_client(args: argparse.Namespace) -> GME:
+    if args.cache_path:
+        cache = SQLiteCache(
+            args.cache_path,
+            ttl=args.ttl,
+            max_stale=args.max_stale,
+            max_entries=args.max_entries,
+        )
+    else:
+        cache = MemoryCache(
+            ttl=args.ttl, max_stale=args.max_stale, max_entries=args.max_entries
+        )
+    return GME(
+        cache=cache,
+        limiter=asyncio.Semaphore(args.concurrency),
+        breaker=CircuitBreaker(
+            failure_rate=args.failure_rate, recovery_time=args.recovery_time
+        ),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the gateway from the command line.
+
+    Args:
+        argv: Command line arguments. Default is ``sys.argv``.
+    """
+
+    gme = _create_client(_parser().parse_args(argv))
+    app = create_app(gme)
+
+    async def close(_app: web.Application) -> None:
+        await gme.close()
+        await gme.cache.close()
+
+    app.on_cleanup.append(close)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Hedged requests to cut tail latency"""
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class HedgePolicy:
+    """
+    Policy for hedged requests.
+
+    The latencies of recent successful requests are recorded; when a request
+    takes longer than the ``percentile`` of those latencies, a duplicate request
+    is sent and the first response is used. At most ``max_hedge_ratio`` of the
+    recent requests are hedged, so that a slow API is not flooded with duplicates.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        max_hedge_ratio: float = 0.1,
+        min_delay: float = 0.0,
+    ) -> None:
+        """Create the policy.
+
+        Args:
+            percentile: Percentile of the recent latencies after which a request
+                is hedged, between 0 and 1.
+            min_samples: Minimum number of recorded latencies before hedging.
+            window: Number of recent requests considered for the latencies and
+                the hedge ratio.
+            max_hedge_ratio: Maximum fraction of recent requests that are hedged.
+            min_delay: Minimum seconds to wait before hedging a request.
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_delay = min_delay
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._hedged: deque[bool] = deque(maxlen=window)
+
+    def delay(self) -> float | None:
+        """Get the seconds to wait before hedging a request.
+
+        Returns:
+            The delay, or ``None`` if not enough latencies were recorded yet.
+        """
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, math.ceil(self.percentile * len(latencies)) - 1)
+        return max(self.min_delay, latencies[max(index, 0)])
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a successful request.
+
+        Args:
+            latency: Seconds taken by the request.
+        """
+        self._latencies.append(latency)
+
+    def record_request(self, hedged: bool) -> None:
+        """Record a request, to keep track of the hedge ratio.
+
+        Args:
+            hedged: Whether the request was hedged.
+        """
+        self._hedged.append(hedged)
+
+    def can_hedge(self) -> bool:
+        """Check if the hedge budget allows hedging another request.
+
+        Returns:
+            ``True`` if the recent hedge ratio is below ``max_hedge_ratio``.
+        """
+        requests = len(self._hedged) + 1
+        return sum(self._hedged) + 1 <= self.max_hedge_ratio * requests
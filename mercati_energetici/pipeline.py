@@ -0,0 +1,109 @@
+"""Overlapping fetch/parse/sink pipeline"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Iterable
+
+_DONE = object()
+
+
+async def run_pipeline(
+    items: Iterable[Any],
+    fetch: Callable[[Any], Awaitable[Any]],
+    sink: Callable[[Any, Any], Awaitable[None] | None],
+    parse: Callable[[Any, Any], Any] | None = None,
+    fetch_workers: int = 4,
+    parse_workers: int = 1,
+    queue_size: int = 8,
+    executor: Executor | None = None,
+) -> int:
+    """Fetch, parse and store many items with overlapping stages.
+
+    Fetch workers, parse workers and the sink run concurrently and are connected
+    by bounded queues: when a stage is slower than the previous one, the previous
+    one waits, so memory stays bounded and throughput is limited by the slowest
+    stage rather than by the sum of all the stages.
+
+    For example, to store the prices of many days of the MGP market:
+
+    ```python
+    async with MercatiElettrici() as me:
+        await run_pipeline(
+            days,
+            fetch=lambda day: me.get_prices("MGP", day),
+            parse=lambda day, data: [(day, r["ora"], r["zona"], r["prezzo"]) for r in data],
+            sink=lambda day, rows: db.insert(rows),
+        )
+    ```
+
+    Args:
+        items: The items to process, for example days.
+        fetch: Coroutine function fetching the data of an item.
+        sink: Function (or coroutine function) receiving an item and its parsed
+            data. It is called by a single task, in completion order.
+        parse: Function receiving an item and its fetched data and returning the
+            parsed data. Default is to pass the fetched data to the sink as is.
+        fetch_workers: Number of concurrent fetches.
+        parse_workers: Number of concurrent parse calls.
+        queue_size: Maximum number of items waiting between two stages.
+        executor: Run ``parse`` in this thread or process pool, to keep CPU
+            bound parsing off the event loop. Default is to run it in the loop.
+
+    Returns:
+        The number of items stored in the sink.
+
+    Raises:
+        Exception: The first exception raised by any stage, after stopping all
+            the others.
+    """
+
+    loop = asyncio.get_running_loop()
+    pending = iter(items)
+    fetched: asyncio.Queue = asyncio.Queue(queue_size)
+    parsed: asyncio.Queue = asyncio.Queue(queue_size)
+    stored = 0
+
+    async def fetch_worker() -> None:
+        for item in pending:
+            await fetched.put((item, await fetch(item)))
+
+    async def fetch_stage() -> None:
+        await asyncio.gather(*(fetch_worker() for _ in range(fetch_workers)))
+        for _ in range(parse_workers):
+            await fetched.put(_DONE)
+
+    async def parse_worker() -> None:
+        while (entry := await fetched.get()) is not _DONE:
+            item, data = entry
+            if parse is not None:
+                if executor is not None:
+                    data = await loop.run_in_executor(executor, parse, item, data)
+                else:
+                    data = parse(item, data)
+            await parsed.put((item, data))
+
+    async def parse_stage() -> None:
+        await asyncio.gather(*(parse_worker() for _ in range(parse_workers)))
+        await parsed.put(_DONE)
+
+    async def sink_stage() -> None:
+        nonlocal stored
+        while (entry := await parsed.get()) is not _DONE:
+            result = sink(*entry)
+            if inspect.isawaitable(result):
+                await result
+            stored += 1
+
+    tasks = [
+        asyncio.ensure_future(stage())
+        for stage in (fetch_stage, parse_stage, sink_stage)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return stored
@@ -0,0 +1,179 @@
+"""Opt-in profiling of the client"""
+from __future__ import annotations
+
+import functools
+import time
+import tracemalloc
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator
+
+_METHOD: ContextVar[str | None] = ContextVar("mercati_energetici_method", default=None)
+
+
+@dataclass
+class StageStats:
+    """Wall time statistics of a stage."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Average seconds spent in the stage."""
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, seconds: float) -> None:
+        """Record a run of the stage.
+
+        Args:
+            seconds: Wall time of the run.
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+@dataclass
+class AllocationStats:
+    """Memory allocation statistics of a public method, from ``tracemalloc``."""
+
+    calls: int = 0
+    allocated: int = 0
+    top: list[str] = field(default_factory=list)
+
+
+class Profiler:
+    """
+    Records the wall time spent in each stage of the requests, per public method:
+    "connect" (until the response headers are received), "transfer" (reading the
+    body), "decode" (JSON decoding), "transform" (reshaping the data in the
+    higher level methods) and "total".
+    Optionally, it takes ``tracemalloc`` snapshots around every public method
+    call and records the allocations. Snapshots are slow and, with concurrent
+    calls, include the allocations of the other calls: enable them only while
+    investigating.
+    """
+
+    def __init__(self, trace_allocations: bool = False, top_allocations: int = 5):
+        """Create the profiler.
+
+        Args:
+            trace_allocations: Take ``tracemalloc`` snapshots around public method
+                calls. Starts ``tracemalloc`` if it is not already tracing.
+            top_allocations: Number of source lines with the largest allocations
+                kept for each method.
+        """
+        self.trace_allocations = trace_allocations
+        self.top_allocations = top_allocations
+        self.stages: dict[tuple[str, str], StageStats] = {}
+        self.allocations: dict[str, AllocationStats] = {}
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record the wall time of a stage for the current public method.
+        Stages outside public methods, like background refreshes, are recorded
+        under "-".
+
+        Args:
+            stage: The stage, for example "decode".
+            seconds: Wall time of the stage.
+        """
+        key = (_METHOD.get() or "-", stage)
+        self.stages.setdefault(key, StageStats()).add(seconds)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time a stage of the current public method.
+
+        Args:
+            stage: The stage, for example "decode".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def method(self, name: str) -> AsyncIterator[None]:
+        """Profile a public method call. Stages of nested calls are attributed
+        to the outermost method.
+
+        Args:
+            name: The name of the method, for example "MGP.get_prices".
+        """
+        if _METHOD.get() is not None:
+            yield
+            return
+
+        token = _METHOD.set(name)
+        snapshot = tracemalloc.take_snapshot() if self.trace_allocations else None
+        try:
+            with self.stage("total"):
+                yield
+        finally:
+            _METHOD.reset(token)
+            if snapshot is not None:
+                self._record_allocations(name, snapshot)
+
+    def _record_allocations(self, name: str, before: tracemalloc.Snapshot) -> None:
+        differences = tracemalloc.take_snapshot().compare_to(before, "lineno")
+        stats = self.allocations.setdefault(name, AllocationStats())
+        stats.calls += 1
+        stats.allocated += sum(max(diff.size_diff, 0) for diff in differences)
+        stats.top = [str(diff) for diff in differences[: self.top_allocations]]
+
+    def reset(self) -> None:
+        """Discard the recorded statistics."""
+        self.stages.clear()
+        self.allocations.clear()
+
+    def report(self) -> str:
+        """Summarize the recorded statistics.
+
+        Returns:
+            A text table with the statistics of every method and stage, followed
+            by the allocations if traced.
+        """
+        lines = [
+            f"{'method':<40} {'stage':<10} {'count':>7} "
+            f"{'total [s]':>10} {'mean [ms]':>10} {'max [ms]':>10}"
+        ]
+        for (method, stage), stats in sorted(self.stages.items()):
+            lines.append(
+                f"{method:<40} {stage:<10} {stats.count:>7} {stats.total:>10.3f} "
+                f"{stats.mean * 1000:>10.2f} {stats.max * 1000:>10.2f}"
+            )
+        for method, stats in sorted(self.allocations.items()):
+            lines.append("")
+            lines.append(
+                f"{method}: {stats.calls} calls, "
+                f"{stats.allocated / stats.calls / 1024:.1f} KiB allocated per call"
+            )
+            lines.extend(f"    {line}" for line in stats.top)
+        return "\n".join(lines)
+
+
+def profiled(method: Callable) -> Callable:
+    """Decorate a public coroutine method to be profiled when the client has a
+    profiler.
+
+    Args:
+        method: The method.
+
+    Returns:
+        The decorated method.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs) -> Any:
+        if self.profiler is None:
+            return await method(self, *args, **kwargs)
+        async with self.profiler.method(method.__qualname__):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,193 @@
+"""Resolution-agnostic daily time series"""
+from __future__ import annotations
+
+from array import array
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import truediv
+from typing import Iterator
+from zoneinfo import ZoneInfo
+
+
+@lru_cache(maxsize=None)
+def market_timezone() -> ZoneInfo:
+    """Get the timezone of the Italian markets, loaded on first use."""
+    return ZoneInfo("Europe/Rome")
+
+
+def periods_in_day(day: date, resolution: int = 60) -> int:
+    """Get the number of market periods in a day, in the Italian timezone.
+
+    Args:
+        day: The day.
+        resolution: Length of a period in minutes, e.g. 60 or 15.
+
+    Returns:
+        The number of periods, e.g. 23, 24 or 25 for hourly periods depending on
+        daylight saving time changes.
+
+    Raises:
+        ValueError: The day can't be divided in periods of this length.
+    """
+
+    start = datetime.combine(day, time(), market_timezone())
+    end = datetime.combine(day + timedelta(days=1), time(), market_timezone())
+    length = end.astimezone(timezone.utc) - start.astimezone(timezone.utc)
+    minutes = int(length.total_seconds()) // 60
+    if resolution <= 0 or minutes % resolution:
+        raise ValueError(
+            f"{day} has {minutes // 60} hours, which can't be divided in periods "
+            f"of {resolution} minutes"
+        )
+    return minutes // resolution
+
+
+class TimeSeries:
+    """
+    Values of a quantity on the periods of a market day.
+    Values are stored in a preallocated ``array`` of doubles, sized from the
+    actual number of periods of the day; missing values are NaN.
+    Periods are in [0 -> len(series) - 1].
+    """
+
+    __slots__ = ("day", "resolution", "values")
+
+    def __init__(
+        self, day: date, resolution: int = 60, values: array | None = None
+    ) -> None:
+        """Create a time series.
+
+        Args:
+            day: The market day.
+            resolution: Length of a period in minutes. Default is 60 (hourly).
+            values: The values of the periods. Default is all NaN.
+        """
+
+        periods = periods_in_day(day, resolution)
+        if values is None:
+            values = array("d", [float("nan")]) * periods
+        elif len(values) != periods:
+            raise ValueError(
+                f"{day} has {periods} periods of {resolution} minutes, "
+                f"got {len(values)} values"
+            )
+        self.day = day
+        self.resolution = resolution
+        self.values = values
+
+    @classmethod
+    def from_records(
+        cls,
+        day: date,
+        records: list[dict],
+        key: str,
+        zone: str | None = None,
+        resolution: int | None = None,
+    ) -> TimeSeries:
+        """Build a time series from the records served by the GME API.
+
+        The period of each record is read from ``periodo`` if present, else from
+        ``ora``, both starting from 1.
+
+        Args:
+            day: The market day.
+            records: The records, like ``[{"ora": 1, "zona": "PUN", "prezzo": 128.69},]``
+            key: The name of the value, for example "prezzo".
+            zone: Keep only the records of this zone. Default is all the records.
+            resolution: Length of a period in minutes. Default is 15 if the
+                records have a ``periodo``, else 60.
+
+        Returns:
+            The time series.
+        """
+
+        periods = {}
+        quarter_hourly = False
+        for record in records:
+            if zone is None or record.get("zona") == zone:
+                quarter_hourly = quarter_hourly or "periodo" in record
+                periods[record.get("periodo", record.get("ora")) - 1] = record[key]
+
+        if resolution is None:
+            resolution = 15 if quarter_hourly else 60
+        series = cls(day, resolution)
+        if periods and not 0 <= min(periods) <= max(periods) < len(series):
+            raise ValueError(
+                f"{day} has {len(series)} periods of {resolution} minutes, "
+                f"got periods from {min(periods) + 1} to {max(periods) + 1}"
+            )
+        for period, value in periods.items():
+            if value is not None:
+                series.values[period] = value
+        return series
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, period: int) -> float:
+        return self.values[period]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+    def __repr__(self) -> str:
+        return f"TimeSeries({self.day}, resolution={self.resolution}, values={list(self.values)})"
+
+    def to_dict(self) -> dict[int, float]:
+        """Convert to a dictionary, skipping missing values.
+
+        Returns:
+            A Python dictionary like: ``{ period : value }``
+        """
+        return {
+            period: value for period, value in enumerate(self.values) if value == value
+        }
+
+    def resample(self, resolution: int, how: str = "mean") -> TimeSeries:
+        """Change the resolution of the series.
+
+        The whole series is processed at once by ``map`` and ``zip`` over the
+        underlying array, with no per-value Python code.
+
+        Args:
+            resolution: The new length of a period in minutes. One of the
+                resolutions must be a multiple of the other, and the day must be
+                divisible in periods of the new length.
+            how: "mean" for intensive quantities like prices, where values are
+                averaged or repeated; "sum" for extensive quantities like volumes,
+                where values are summed or evenly split.
+
+        Returns:
+            A new time series.
+        """
+
+        if how not in ("mean", "sum"):
+            raise ValueError("how must be 'mean' or 'sum'")
+        if max(resolution, self.resolution) % min(resolution, self.resolution):
+            raise ValueError(f"Can't resample {self.resolution} to {resolution}")
+        periods_in_day(self.day, resolution)
+        if resolution == self.resolution:
+            return TimeSeries(self.day, resolution, array("d", self.values))
+
+        if resolution > self.resolution:
+            factor = resolution // self.resolution
+            # Group consecutive values by zipping an iterator with itself
+            values = array("d", map(sum, zip(*[iter(self.values)] * factor)))
+            if how == "mean":
+                values = array("d", map(truediv, values, repeat(factor)))
+        else:
+            factor = self.resolution // resolution
+            values = array("d", chain.from_iterable(zip(*repeat(self.values, factor))))
+            if how == "sum":
+                values = array("d", map(truediv, values, repeat(factor)))
+        return TimeSeries(self.day, resolution, values)
+
+    def mean(self) -> float:
+        """Average of the values, skipping missing ones.
+
+        Returns:
+            The average, or NaN if all values are missing.
+        """
+        values = [value for value in self.values if value == value]
+        return sum(values) / len(values) if values else float("nan")
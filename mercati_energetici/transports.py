@@ -0,0 +1,196 @@
+"""HTTP transports used to reach the GME APP API"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import ClientError, ClientSession
+from yarl import URL
+
+from .exceptions import MercatiEnergeticiConnectionError
+
+
+@dataclass
+class TransportResponse:
+    """A fully read HTTP response, independent of the HTTP library used.
+    ``timings`` holds the seconds spent in the "connect" (until the headers are
+    received) and "transfer" (reading the body) stages, when measured."""
+
+    status: int
+    content_type: str
+    body: bytes
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def text(self) -> str:
+        """Decode the body as text.
+
+        Returns:
+            The body of the response as a string.
+        """
+        return self.body.decode("utf-8", errors="replace")
+
+
+class Transport(ABC):
+    """
+    Base class for the HTTP transports.
+    A transport sends a GET request and returns the fully read response,
+    leaving the interpretation of status codes and payloads to the client.
+    """
+
+    @abstractmethod
+    async def get(self, url: URL, headers: dict[str, str]) -> TransportResponse:
+        """Send a GET request.
+
+        Args:
+            url: The URL to request.
+            headers: The headers to send with the request.
+
+        Returns:
+            The response of the server.
+
+        Raises:
+            MercatiEnergeticiConnectionError: The server could not be reached.
+        """
+
+    async def close(self) -> None:
+        """Release the resources held by the transport."""
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 transport based on ``aiohttp``. This is the default transport."""
+
+    def __init__(self, session: ClientSession | None = None) -> None:
+        """Create the transport.
+
+        Args:
+            session: An existing ``aiohttp.ClientSession`` to use. If not provided,
+                a new session is created on the first request and closed together
+                with the transport.
+        """
+        self.session = session
+        self.close_session = False
+
+    async def get(self, url: URL, headers: dict[str, str]) -> TransportResponse:
+        if self.session is None:
+            self.session = ClientSession()
+            self.close_session = True
+
+        try:
+            start = time.perf_counter()
+            async with self.session.get(url, headers=headers) as response:
+                connected = time.perf_counter()
+                body = await response.read()
+                return TransportResponse(
+                    status=response.status,
+                    content_type=response.headers.get("Content-Type", ""),
+                    body=body,
+                    timings={
+                        "connect": connected - start,
+                        "transfer": time.perf_counter() - connected,
+                    },
+                )
+        except (ClientError, asyncio.TimeoutError) as exception:
+            raise MercatiEnergeticiConnectionError(
+                "Error while communicating with the GME API"
+            ) from exception
+
+    async def close(self) -> None:
+        if self.session and self.close_session:
+            await self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 transport based on ``httpx``.
+    All the requests are multiplexed over a single connection to the GME host,
+    which avoids opening many TLS connections on large fan-outs.
+    Requires ``httpx`` with HTTP/2 support: ``pip install mercati-energetici[http2]``.
+    """
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        """Create the transport.
+
+        Args:
+            timeout: Timeout in seconds of every request.
+        """
+        try:
+            import httpx
+        except ImportError as exception:
+            raise ImportError(
+                "HTTP2Transport requires httpx: pip install mercati-energetici[http2]"
+            ) from exception
+
+        self._httpx = httpx
+        self.timeout = timeout
+        self.client: Any = None
+
+    async def get(self, url: URL, headers: dict[str, str]) -> TransportResponse:
+        if self.client is None:
+            self.client = self._httpx.AsyncClient(http2=True, timeout=self.timeout)
+
+        try:
+            start = time.perf_counter()
+            async with self.client.stream("GET", str(url), headers=headers) as response:
+                connected = time.perf_counter()
+                body = await response.aread()
+        except self._httpx.HTTPError as exception:
+            raise MercatiEnergeticiConnectionError(
+                "Error while communicating with the GME API"
+            ) from exception
+        return TransportResponse(
+            status=response.status_code,
+            content_type=response.headers.get("Content-Type", ""),
+            body=body,
+            timings={
+                "connect": connected - start,
+                "transfer": time.perf_counter() - connected,
+            },
+        )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+
+@dataclass
+class FakeTransport(Transport):
+    """
+    In-process transport serving canned payloads, for tests and benchmarks.
+
+    The responses are looked up by request path (e.g. ``/GetPrezziME/20230323/MGP``).
+    A value can be a JSON-serializable payload, a ``TransportResponse``, an
+    exception to raise, or a callable receiving the path and returning one of those.
+    Unknown paths are answered with a 404 status.
+    """
+
+    responses: dict[str, Any] = field(default_factory=dict)
+    latency: float = 0.0
+    requests: list[str] = field(default_factory=list)
+
+    async def get(self, url: URL, headers: dict[str, str]) -> TransportResponse:
+        self.requests.append(url.path)
+        start = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        timings = {"connect": time.perf_counter() - start, "transfer": 0.0}
+
+        if url.path not in self.responses:
+            return TransportResponse(404, "text/plain", b"Not Found")
+        response = self.responses[url.path]
+        if callable(response):
+            response = response(url.path)
+        if isinstance(response, BaseException):
+            raise response
+        if isinstance(response, TransportResponse):
+            return response
+        return TransportResponse(
+            200,
+            "application/json; charset=utf-8",
+            json.dumps(response).encode("utf-8"),
+            timings,
+        )
@@ -0,0 +1,135 @@
+"""Cache warm-up for configured markets and windows"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable
+
+from .exceptions import MercatiEnergeticiError
+
+
+@dataclass
+class WarmupSpec:
+    """
+    Declarative description of the data to pre-fetch.
+
+    For example ``WarmupSpec("GetPrezziME", ["MGP", "MI-A1"], days=7)`` fetches
+    the prices of the MGP and MI-A1 markets of the last 7 days, while
+    ``WarmupSpec("GetLiquidita", days=7)`` fetches an endpoint with no market.
+    Markets can contain the ``{day}`` and ``{next_day}`` placeholders, formatted
+    with the requested day, for products named after the delivery day:
+    ``WarmupSpec("GetEsitiGasAsta", ["MGP-{next_day:%Y-%m-%d}"])``.
+    Responses hold all the zones, so there is no need to list them.
+
+    Attributes:
+        endpoint: The GME APP API endpoint, for example "GetPrezziME".
+        markets: The markets, products or companies to fetch. Default is none,
+            for endpoints taking only a date.
+        days: Number of days of the window, ending with ``end``.
+        end: Last day of the window. Default is today.
+    """
+
+    endpoint: str
+    markets: list[str] = field(default_factory=list)
+    days: int = 7
+    end: date | None = None
+
+    def uris(self) -> list[str]:
+        """Get the request URIs described by the spec.
+
+        Returns:
+            A list of URIs like ``["/GetPrezziME/20230323/MGP",]``.
+        """
+        end = self.end or date.today()
+        uris = []
+        for offset in range(self.days):
+            day = end - timedelta(days=offset)
+            prefix = f"/{self.endpoint}/{day.strftime('%Y%m%d')}"
+            if not self.markets:
+                uris.append(prefix)
+            for market in self.markets:
+                market = market.format(day=day, next_day=day + timedelta(days=1))
+                uris.append(f"{prefix}/{market}")
+        return uris
+
+
+@dataclass
+class WarmupProgress:
+    """Progress of a warm-up."""
+
+    total: int
+    done: int = 0
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def completed(self) -> bool:
+        """Whether all the requests were processed."""
+        return self.done + len(self.failed) >= self.total
+
+
+async def warm_up(
+    client: Any,
+    specs: list[WarmupSpec],
+    concurrency: int = 8,
+    progress: Callable[[WarmupProgress], None] | None = None,
+    deadline: float | None = None,
+) -> WarmupProgress:
+    """Pre-populate the cache of a client.
+
+    Requests run concurrently, up to ``concurrency`` at a time. Failed requests,
+    for example for days not yet published, are recorded and do not stop the
+    warm-up.
+
+    Args:
+        client: A ``MercatiEnergetici`` object (typically ``GME``) with a cache.
+        specs: The data to pre-fetch.
+        concurrency: Maximum number of concurrent requests.
+        progress: Function called with the progress after every request.
+        deadline: Seconds after which the warm-up stops. Requests not completed
+            are recorded as failed with an ``asyncio.TimeoutError``. Default is
+            no deadline.
+
+    Returns:
+        The final progress.
+    """
+
+    if client.cache is None:
+        raise ValueError("Warming up requires a client with a cache")
+
+    uris = list(dict.fromkeys(uri for spec in specs for uri in spec.uris()))
+    state = WarmupProgress(total=len(uris))
+    pending = iter(uris)
+    succeeded: set[str] = set()
+
+    async def worker() -> None:
+        for uri in pending:
+            try:
+                await client._request(uri)
+            except MercatiEnergeticiError as exception:
+                state.failed[uri] = exception
+            else:
+                state.done += 1
+                succeeded.add(uri)
+            if progress is not None:
+                progress(state)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        _, running = await asyncio.wait(workers, timeout=deadline)
+    finally:
+        # Also stop the workers if the warm-up itself is cancelled
+        for task in workers:
+            task.cancel()
+    if running:
+        await asyncio.wait(running)
+    for task in workers:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+    for uri in uris:
+        if uri not in succeeded and uri not in state.failed:
+            state.failed[uri] = asyncio.TimeoutError(
+                f"Not completed within the deadline of {deadline} s"
+            )
+    return state
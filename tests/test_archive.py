@@ -0,0 +1,63 @@
+"""Test the binary archive."""
+import math
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from mercati_energetici import Archive, write_archive
+from mercati_energetici import archive as archive_module
+
+DATA = {
+    date(2023, 3, 25): {"PUN": {h: 100.0 + h for h in range(24)}},
+    date(2023, 3, 26): {"PUN": {h: 200.0 + h for h in range(23)}, "SUD": {0: 1.5}},
+    date(2023, 3, 28): {"SUD": {0: 2.5}},
+}
+
+
+class TestArchive:
+    def test_roundtrip(self, tmp_path):
+        path = str(tmp_path / "prices.gme")
+        write_archive(path, DATA)
+        with Archive(path) as archive:
+            assert archive.zones == ["PUN", "SUD"]
+            assert archive.start == date(2023, 3, 25)
+            assert archive.end == date(2023, 3, 28)
+            assert (
+                archive.get_day(date(2023, 3, 25), "PUN")
+                == DATA[date(2023, 3, 25)]["PUN"]
+            )
+            assert (
+                archive.get_day(date(2023, 3, 26), "PUN")
+                == DATA[date(2023, 3, 26)]["PUN"]
+            )
+            assert archive.get_day(date(2023, 3, 27), "SUD") == {}
+            values = archive.slice("SUD", date(2023, 3, 26), date(2023, 3, 28))
+            assert len(values) == 3 * archive.periods
+            assert values[0] == 1.5 and values[2 * archive.periods] == 2.5
+            assert math.isnan(values[1])
+            values.release()
+            with pytest.raises(KeyError):
+                archive.slice("NORD")
+            with pytest.raises(IndexError):
+                archive.slice("PUN", date(2023, 3, 1))
+
+    def test_big_endian(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "prices.gme")
+        write_archive(path, DATA)
+        little = (tmp_path / "prices.gme").read_bytes()
+        monkeypatch.setattr(archive_module, "sys", SimpleNamespace(byteorder="big"))
+        write_archive(path, DATA)
+        # The values are swapped on write and swapped back on read
+        assert (tmp_path / "prices.gme").read_bytes() != little
+        with Archive(path) as archive:
+            assert (
+                archive.get_day(date(2023, 3, 25), "PUN")
+                == DATA[date(2023, 3, 25)]["PUN"]
+            )
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / "invalid.gme"
+        path.write_bytes(b"not an archive")
+        with pytest.raises(ValueError):
+            Archive(str(path))
+        with pytest.raises(ValueError):
+            write_archive(str(path), {date(2023, 3, 25): {"PUN": {25: 1.0}}})
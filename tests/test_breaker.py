@@ -0,0 +1,81 @@
+"""Test the circuit breaker."""
+import pytest
+from mercati_energetici import GME, CircuitBreaker, FakeTransport, MemoryCache
+from mercati_energetici.transports import TransportResponse
+from mercati_energetici.exceptions import (
+    MercatiEnergeticiCircuitOpenError,
+    MercatiEnergeticiConnectionError,
+    MercatiEnergeticiRequestError,
+)
+
+HOST = "app.mercatienergetici.org"
+MARKETS = [{"data": 20230323, "mercato": "MGP", "volumi": 1.0}]
+
+
+class TestCircuitBreaker:
+    def test_states(self):
+        breaker = CircuitBreaker(min_requests=4, failure_rate=0.5, recovery_time=0)
+        for success in (True, True, False):
+            breaker.before_request(HOST)
+            (breaker.record_success if success else breaker.record_failure)(HOST)
+        assert breaker.state(HOST) == "closed"
+        breaker.before_request(HOST)
+        breaker.record_failure(HOST)
+        # Recovery time is 0, so it is immediately ready for probing
+        assert breaker.state(HOST) == "half-open"
+        breaker.before_request(HOST)
+        with pytest.raises(MercatiEnergeticiCircuitOpenError):
+            breaker.before_request(HOST)
+        breaker.record_success(HOST)
+        assert breaker.state(HOST) == "closed"
+
+    def test_open(self):
+        breaker = CircuitBreaker(min_requests=1, recovery_time=60)
+        breaker.before_request(HOST)
+        breaker.record_failure(HOST)
+        assert breaker.state(HOST) == "open"
+        with pytest.raises(MercatiEnergeticiCircuitOpenError):
+            breaker.before_request(HOST)
+
+
+@pytest.mark.asyncio
+class TestClientBreaker:
+    async def test_fail_fast(self):
+        transport = FakeTransport(
+            {"/GetMercatiElettrici": TransportResponse(502, "text/html", b"")}
+        )
+        breaker = CircuitBreaker(min_requests=2, recovery_time=60)
+        async with GME(transport=transport, breaker=breaker) as gme:
+            for _ in range(2):
+                with pytest.raises(MercatiEnergeticiConnectionError):
+                    await gme.elettrici.get_markets()
+            with pytest.raises(MercatiEnergeticiCircuitOpenError):
+                await gme.elettrici.get_markets()
+            # The circuit is shared by all the markets on the same host
+            with pytest.raises(MercatiEnergeticiCircuitOpenError):
+                await gme.gas.get_markets()
+        assert len(transport.requests) == 2
+
+    async def test_serve_from_cache(self):
+        transport = FakeTransport({"/GetMercatiElettrici": MARKETS})
+        breaker = CircuitBreaker(min_requests=1, recovery_time=60)
+        cache = MemoryCache(ttl=0)
+        async with GME(transport=transport, breaker=breaker, cache=cache) as gme:
+            assert await gme.elettrici.get_markets() == MARKETS
+            transport.responses["/GetMercatiElettrici"] = TransportResponse(
+                503, "text/html", b""
+            )
+            with pytest.raises(MercatiEnergeticiConnectionError):
+                await gme.elettrici.get_markets()
+            assert await gme.elettrici.get_markets() == MARKETS
+            with pytest.raises(MercatiEnergeticiCircuitOpenError):
+                await gme.gas.get_markets()
+
+    async def test_request_errors(self):
+        transport = FakeTransport()
+        breaker = CircuitBreaker(min_requests=1)
+        async with GME(transport=transport, breaker=breaker) as gme:
+            for _ in range(3):
+                with pytest.raises(MercatiEnergeticiRequestError):
+                    await gme.gas.get_markets()
+        assert breaker.state(HOST) == "closed"
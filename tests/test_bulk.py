@@ -0,0 +1,43 @@
+"""Test the bulk operations."""
+import asyncio
+import pytest
+from mercati_energetici import MGP, FakeTransport, gather_with_deadline
+from mercati_energetici.exceptions import MercatiEnergeticiRequestError
+
+PRICES = [{"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "PUN", "prezzo": 1.0}]
+
+
+@pytest.mark.asyncio
+class TestGatherWithDeadline:
+    async def test_partial_results(self):
+        transport = FakeTransport({"/GetPrezziME/20230323/MGP": PRICES})
+        async with MGP(transport=transport) as mgp:
+            result = await gather_with_deadline(
+                {day: mgp.get_prices(day) for day in ("20230323", "20230324")}
+            )
+        assert result.results == {"20230323": {0: 1.0}}
+        assert isinstance(result.errors["20230324"], MercatiEnergeticiRequestError)
+        assert not result.complete
+
+    async def test_deadline(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def fast():
+            return 1
+
+        result = await asyncio.wait_for(
+            gather_with_deadline({"slow": slow(), "fast": fast()}, deadline=0.05), 1
+        )
+        assert result.results == {"fast": 1}
+        assert isinstance(result.errors["slow"], asyncio.TimeoutError)
+        assert cancelled == [True]
+
+    async def test_empty(self):
+        assert (await gather_with_deadline({})).complete
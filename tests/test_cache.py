@@ -0,0 +1,129 @@
+"""Test the caches."""
+import asyncio
+import pytest, pytest_asyncio
+from mercati_energetici import GME, FakeTransport, MemoryCache, SQLiteCache
+
+PRICES = [
+    {"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "PUN", "prezzo": 128.69},
+]
+
+
+@pytest_asyncio.fixture
+async def transport():
+    yield FakeTransport({"/GetPrezziME/20230323/MGP": PRICES}, latency=0.05)
+
+
+@pytest.mark.asyncio
+class TestMemoryCache:
+    async def test_eviction(self):
+        cache = MemoryCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            await cache.set(key, [key])
+        assert await cache.get("a") is None
+        assert (await cache.get("c")).value == ["c"]
+
+
+@pytest.mark.asyncio
+class TestSQLiteCache:
+    async def test_get_set(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+        assert await cache.get("a") is None
+        await cache.set("a", PRICES)
+        entry = await cache.get("a")
+        assert entry.value == PRICES
+        assert cache.is_fresh(entry)
+        await cache.close()
+
+    async def test_eviction(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=60, max_entries=2)
+        await cache.set("expired", [0])
+        cache._execute("UPDATE entries SET created = created - 3600")
+        for key in ("a", "b", "c"):
+            await cache.set(key, [key])
+        assert cache._execute("SELECT key FROM entries ORDER BY key") == [
+            ("b",),
+            ("c",),
+        ]
+        await cache.close()
+
+    async def test_shared_fetch(self, tmp_path, transport):
+        # Two caches over the same file behave like two worker processes
+        path = str(tmp_path / "cache.db")
+        caches = [SQLiteCache(path, poll_interval=0.01) for _ in range(2)]
+        clients = [GME(transport=transport, cache=cache) for cache in caches]
+        results = await asyncio.gather(
+            *(client.mgp.get_prices("20230323") for client in clients for _ in range(3))
+        )
+        assert all(result == {0: 128.69} for result in results)
+        assert transport.requests == ["/GetPrezziME/20230323/MGP"]
+        for cache in caches:
+            await cache.close()
+
+    async def test_abandoned_lock(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        crashed = SQLiteCache(path, lock_timeout=0.05)
+        assert crashed._try_acquire("a")
+        cache = SQLiteCache(path, lock_timeout=0.05, poll_interval=0.01)
+        async with cache.lock("a"):
+            pass
+        await crashed.close()
+        await cache.close()
+
+    async def test_lock_taken_over(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        slow = SQLiteCache(path, lock_timeout=0.05)
+        other = SQLiteCache(path, lock_timeout=10)
+        async with slow.lock("a"):
+            await asyncio.sleep(0.1)
+            assert other._try_acquire("a") is not None
+        # Releasing the expired lock leaves the new owner's lock in place
+        assert other._try_acquire("a") is None
+        await slow.close()
+        await other.close()
+
+
+@pytest.mark.asyncio
+class TestStaleWhileRevalidate:
+    async def test_stale(self, transport):
+        async with GME(
+            transport=transport, cache=MemoryCache(ttl=0, max_stale=60)
+        ) as gme:
+            await gme.mgp.get_prices("20230323")
+            assert len(transport.requests) == 1
+            # Served from the cache immediately, refreshed in the background
+            results = await asyncio.gather(
+                *(gme.mgp.get_prices("20230323") for _ in range(5))
+            )
+            assert all(result == {0: 128.69} for result in results)
+            assert len(transport.requests) == 2
+            await asyncio.gather(*gme._refreshing.values())
+            assert not gme._refreshing
+
+    async def test_close_cancels_refresh(self, transport):
+        # The transport is owned by the caller, but the refreshes by the client
+        async with GME(
+            transport=transport, cache=MemoryCache(ttl=0, max_stale=60)
+        ) as gme:
+            await gme.mgp.get_prices("20230323")
+            await gme.mgp.get_prices("20230323")
+            tasks = list(gme._refreshing.values())
+            assert tasks
+        assert all(task.done() for task in tasks)
+        assert not gme._refreshing
+
+    async def test_refresh_unexpected_error(self, tmp_path, transport, caplog):
+        cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=0, max_stale=60)
+        async with GME(transport=transport, cache=cache) as gme:
+            await gme.mgp.get_prices("20230323")
+            await gme.mgp.get_prices("20230323")
+            await cache.close()
+            await asyncio.gather(*gme._refreshing.values())
+        assert "Unexpected error while refreshing" in caplog.text
+
+    async def test_hard_expiry(self, transport):
+        async with GME(
+            transport=transport, cache=MemoryCache(ttl=0, max_stale=0)
+        ) as gme:
+            await gme.mgp.get_prices("20230323")
+            await gme.mgp.get_prices("20230323")
+        assert len(transport.requests) == 2
@@ -0,0 +1,93 @@
+"""Test the change detection."""
+import pytest
+from mercati_energetici import MercatiElettrici, FakeTransport, ChangeTracker
+
+
+def prices(values):
+    return [
+        {
+            "data": 20230323,
+            "ora": hour,
+            "mercato": "MGP",
+            "zona": "PUN",
+            "prezzo": value,
+        }
+        for hour, value in enumerate(values, start=1)
+    ]
+
+
+@pytest.mark.asyncio
+class TestChangeTracker:
+    async def test_revisions(self):
+        reported = []
+        transport = FakeTransport(
+            {"/GetPrezziME/20230323/MGP": prices([1.0, 2.0, 3.0])}
+        )
+        tracker = ChangeTracker(reported.append)
+        async with MercatiElettrici(transport=transport, change_tracker=tracker) as me:
+            await me.get_prices("MGP", "20230323")
+            await me.get_prices("MGP", "20230323")
+            assert reported == []
+            transport.responses["/GetPrezziME/20230323/MGP"] = prices(
+                [1.0, 2.5, 3.0, 4.0]
+            )
+            await me.get_prices("MGP", "20230323")
+            transport.responses["/GetPrezziME/20230323/MGP"] = prices([1.0])
+            await me.get_prices("MGP", "20230323")
+        assert len(reported) == 2
+        revision = reported[0]
+        assert revision.uri == "/GetPrezziME/20230323/MGP"
+        assert [record["ora"] for record in revision.changed] == [2]
+        assert [record["ora"] for record in revision.added] == [4]
+        assert revision.removed == []
+        assert [dict(key)["ora"] for key in reported[1].removed] == [2, 3, 4]
+
+    async def test_async_callback(self):
+        reported = []
+
+        async def callback(changes):
+            reported.append(changes)
+
+        tracker = ChangeTracker(callback)
+        await tracker.observe("/GetDisclaimer/EN", {"testo": "a"})
+        changes = await tracker.observe("/GetDisclaimer/EN", {"testo": "b"})
+        assert reported == [changes]
+        assert changes.changed == [{"testo": "b"}]
+
+    async def test_callback_error(self, caplog):
+        reported = []
+
+        def callback(changes):
+            if not reported:
+                reported.append(None)
+                raise RuntimeError("Database unavailable")
+            reported.append(changes)
+
+        transport = FakeTransport({"/GetPrezziME/20230323/MGP": prices([1.0])})
+        tracker = ChangeTracker(callback)
+        async with MercatiElettrici(transport=transport, change_tracker=tracker) as me:
+            await me.get_prices("MGP", "20230323")
+            transport.responses["/GetPrezziME/20230323/MGP"] = prices([2.0])
+            # The request succeeds, and the revision is reported on the next fetch
+            assert await me.get_prices("MGP", "20230323") == prices([2.0])
+            assert "Failed to report the changes" in caplog.text
+            await me.get_prices("MGP", "20230323")
+        assert reported[1].changed == prices([2.0])
+
+    async def test_duplicate_keys(self):
+        reported = []
+        tracker = ChangeTracker(reported.append)
+        await tracker.observe("/GetEsitiGasAsta", [{"prezzo": 1.0}, {"prezzo": 2.0}])
+        await tracker.observe("/GetEsitiGasAsta", [{"prezzo": 1.0}, {"prezzo": 3.0}])
+        assert reported[0].replaced
+        assert reported[0].added == [{"prezzo": 1.0}, {"prezzo": 3.0}]
+        assert reported[0].changed == [] and reported[0].removed == []
+
+    async def test_max_entries(self):
+        reported = []
+        tracker = ChangeTracker(reported.append, max_entries=1)
+        await tracker.observe("/GetDisclaimer/EN", {"testo": "a"})
+        await tracker.observe("/GetDisclaimer/IT", {"testo": "a"})
+        # The baseline of the English disclaimer was evicted
+        assert await tracker.observe("/GetDisclaimer/EN", {"testo": "b"}) is None
+        assert list(tracker._baselines) == ["/GetDisclaimer/EN"]
@@ -0,0 +1,64 @@
+"""Test the unified client."""
+import asyncio
+import pytest, pytest_asyncio
+from mercati_energetici import GME, FakeTransport, MemoryCache
+
+PRICES = [
+    {"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "PUN", "prezzo": 128.69},
+    {"data": 20230323, "ora": 2, "mercato": "MGP", "zona": "PUN", "prezzo": 120.0},
+]
+
+
+@pytest_asyncio.fixture
+async def transport():
+    yield FakeTransport(
+        {
+            "/GetPrezziME/20230323/MGP": PRICES,
+            "/GetMercatiGas": [{"data": 20230323, "prodotto": "MGP-2023-03-24"}],
+        },
+        latency=0.01,
+    )
+
+
+@pytest.mark.asyncio
+class TestGME:
+    async def test_shared_resources(self, transport):
+        async with GME(transport=transport, cache=MemoryCache()) as gme:
+            for api in (gme.elettrici, gme.mgp, gme.gas, gme.ambientali):
+                assert api.transport is transport
+                assert api.cache is gme.cache
+            await gme.elettrici.get_prices("MGP", "20230323")
+            assert await gme.mgp.get_prices("20230323") == {0: 128.69, 1: 120.0}
+            await gme.gas.get_markets()
+        assert transport.requests == ["/GetPrezziME/20230323/MGP", "/GetMercatiGas"]
+
+    async def test_coalescing(self, transport):
+        async with GME(transport=transport, cache=MemoryCache()) as gme:
+            results = await asyncio.gather(
+                *(gme.mgp.daily_pun("20230323") for _ in range(10))
+            )
+        assert len(set(results)) == 1
+        assert len(transport.requests) == 1
+
+    async def test_cache_expiry(self, transport):
+        async with GME(transport=transport, cache=MemoryCache(ttl=0)) as gme:
+            await gme.gas.get_markets()
+            await gme.gas.get_markets()
+        assert len(transport.requests) == 2
+
+    async def test_limiter(self, transport):
+        running = 0
+        peak = 0
+
+        async def get(url, headers):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return await FakeTransport.get(transport, url, headers)
+
+        transport.get = get
+        async with GME(transport=transport, limiter=asyncio.Semaphore(2)) as gme:
+            await asyncio.gather(*(gme.gas.get_markets() for _ in range(6)))
+        assert peak == 2
@@ -0,0 +1,35 @@
+"""Test the payload encoding."""
+import json
+from mercati_energetici.codec import decode_payload, encode_payload
+
+VOLUMES = [
+    {
+        "data": 20230323,
+        "ora": hour,
+        "mercato": "MGP",
+        "zona": zone,
+        "acquisti": 482.198 * hour,
+        "vendite": 1001.576 * hour,
+    }
+    for hour in range(1, 25)
+    for zone in ("CALA", "CNOR", "CSUD", "NORD", "SARD", "SICI", "SUD", "Totale")
+]
+
+
+class TestCodec:
+    def test_roundtrip(self):
+        for payload in (
+            VOLUMES,
+            {"id": 1, "testo": "text", "lingua": "EN"},
+            [{"a": 1}, {"b": 2}],
+            [],
+        ):
+            assert decode_payload(encode_payload(payload)) == payload
+
+    def test_compression(self):
+        text = json.dumps(VOLUMES).encode("utf-8")
+        assert len(encode_payload(VOLUMES)) < len(text) / 4
+
+    def test_plain_json(self):
+        assert decode_payload(json.dumps(VOLUMES)) == VOLUMES
+        assert decode_payload(json.dumps(VOLUMES).encode("utf-8")) == VOLUMES
@@ -0,0 +1,93 @@
+"""Test the cross-commodity dataset."""
+import math
+import pytest
+from datetime import date
+from mercati_energetici import GME, FakeTransport
+from mercati_energetici.exceptions import MercatiEnergeticiConnectionError
+
+
+def pun(day, price):
+    return [
+        {"data": day, "ora": hour, "mercato": "MGP", "zona": "PUN", "prezzo": price}
+        for hour in (1, 2)
+    ]
+
+
+RESPONSES = {
+    "/GetPrezziME/20230323/MGP": pun(20230323, 100.0),
+    "/GetPrezziME/20230324/MGP": pun(20230324, 110.0),
+    "/GetEsitiGasAsta/20230322/MGP-2023-03-23": [{"prezzo": 45.0}],
+    "/GetEsitiGasAsta/20230323/MGP-2023-03-24": [{"prezzo": None}],
+    "/GetEsitiAmbiente/20230323/GO": [],
+    "/GetEsitiAmbiente/20230324/GO": [
+        {"prezzoRiferimento": 6.0, "volumi": 1000.0},
+        {"prezzoRiferimento": 9.0, "volumi": 2000.0},
+    ],
+}
+
+
+@pytest.mark.asyncio
+class TestDailyDataset:
+    async def test_dataset(self):
+        transport = FakeTransport(RESPONSES)
+        async with GME(transport=transport) as gme:
+            dataset = await gme.get_daily_dataset(
+                date(2023, 3, 23), date(2023, 3, 24), environmental_markets=["GO"]
+            )
+        assert list(dataset) == ["date", "pun", "gas_MGP", "GO", "errors"]
+        assert dataset["errors"] == {}
+        assert dataset["date"] == [date(2023, 3, 23), date(2023, 3, 24)]
+        assert list(dataset["pun"]) == [100.0, 110.0]
+        assert dataset["gas_MGP"][0] == 45.0 and math.isnan(dataset["gas_MGP"][1])
+        assert math.isnan(dataset["GO"][0]) and dataset["GO"][1] == 8.0
+
+    async def test_errors(self):
+        responses = dict(RESPONSES)
+        responses["/GetPrezziME/20230324/MGP"] = MercatiEnergeticiConnectionError()
+        transport = FakeTransport(responses)
+        async with GME(transport=transport) as gme:
+            dataset = await gme.get_daily_dataset(
+                date(2023, 3, 23), date(2023, 3, 24), environmental_markets=[]
+            )
+        assert dataset["pun"][0] == 100.0 and math.isnan(dataset["pun"][1])
+        assert list(dataset["errors"]) == [("pun", date(2023, 3, 24))]
+
+    async def test_unknown_market(self):
+        transport = FakeTransport(RESPONSES)
+        async with GME(transport=transport) as gme:
+            dataset = await gme.get_daily_dataset(
+                date(2023, 3, 23), date(2023, 3, 24), environmental_markets=["GOO"]
+            )
+        assert all(math.isnan(price) for price in dataset["GOO"])
+        assert list(dataset["errors"]) == [
+            ("GOO", date(2023, 3, 23)),
+            ("GOO", date(2023, 3, 24)),
+        ]
+
+    async def test_concurrency(self):
+        in_flight = peak = 0
+
+        class CountingTransport(FakeTransport):
+            async def get(self, url, headers):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    return await super().get(url, headers)
+                finally:
+                    in_flight -= 1
+
+        transport = CountingTransport(RESPONSES, latency=0.01)
+        async with GME(transport=transport) as gme:
+            dataset = await gme.get_daily_dataset(
+                date(2023, 1, 1), date(2023, 3, 24), concurrency=4
+            )
+        assert len(transport.requests) == 4 * len(dataset["date"])
+        assert peak == 4
+
+    async def test_unsupported_product(self):
+        async with GME(transport=FakeTransport()) as gme:
+            with pytest.raises(ValueError):
+                await gme.get_daily_dataset(
+                    date(2023, 3, 23), date(2023, 3, 24), gas_products=["MGS"]
+                )
@@ -1,7 +1,7 @@
 """Test the electricity markets module."""
 import pytest, pytest_asyncio
 from datetime import date
-from mercati_energetici import MercatiElettrici, MGP
+from mercati_energetici import MercatiElettrici, MGP, FakeTransport
 from mercati_energetici.exceptions import (
     MercatiEnergeticiZoneError,
     MercatiEnergeticiRequestError,
@@ -173,4 +173,32 @@ class TestMGP:
         )
         # Older dates are not available from the API
         with pytest.raises(MercatiEnergeticiRequestError):
-            await mgp.get_liquidity(date(2020, 1, 1))
\ No newline at end of file
+            await mgp.get_liquidity(date(2020, 1, 1))
+
+
+@pytest.mark.asyncio
+class TestMGPZonalVolumes:
+    async def test_zonal_volumes(self):
+        records = [
+            {
+                "data": 20230323,
+                "ora": hour,
+                "mercato": "MGP",
+                "zona": zone,
+                "acquisti": 10.0 * hour,
+                "vendite": 20.0 * hour,
+            }
+            for hour in (1, 2)
+            for zone in ("NORD", "Totale")
+        ]
+        transport = FakeTransport({"/GetQuantitaME/20230323/MGP": records})
+        async with MGP(transport=transport) as mgp:
+            bought, sold = await mgp.get_zonal_volumes("20230323")
+            assert set(bought) == set(sold) == {"NORD", "Totale"}
+            assert bought["NORD"] == {0: 10.0, 1: 20.0}
+            assert sold["NORD"] == {0: 20.0, 1: 40.0}
+            assert await mgp.get_volumes("20230323") == (
+                {0: 10.0, 1: 20.0},
+                {0: 20.0, 1: 40.0},
+            )
+        assert len(transport.requests) == 2
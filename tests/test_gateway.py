@@ -0,0 +1,71 @@
+"""Test the caching gateway."""
+import pytest, pytest_asyncio
+from aiohttp.test_utils import TestClient, TestServer
+from mercati_energetici import GME, FakeTransport, MemoryCache
+from mercati_energetici.gateway import _create_client, _parser, create_app
+from mercati_energetici.transports import TransportResponse
+
+PRICES = [
+    {"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "PUN", "prezzo": 128.69},
+    {"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "SUD", "prezzo": 120.0},
+]
+
+
+@pytest_asyncio.fixture
+async def transport():
+    yield FakeTransport(
+        {
+            "/GetPrezziME/20230323/MGP": PRICES,
+            "/GetMercatiGas": TransportResponse(502, "text/html", b""),
+        }
+    )
+
+
+@pytest_asyncio.fixture
+async def client(transport):
+    async with GME(transport=transport, cache=MemoryCache()) as gme:
+        async with TestClient(TestServer(create_app(gme))) as client:
+            yield client
+
+
+@pytest.mark.asyncio
+class TestGateway:
+    async def test_passthrough(self, client, transport):
+        for _ in range(2):
+            response = await client.get("/GetPrezziME/20230323/MGP")
+            assert response.status == 200
+            assert await response.json() == PRICES
+        assert transport.requests == ["/GetPrezziME/20230323/MGP"]
+
+    async def test_mgp(self, client, transport):
+        response = await client.get("/mgp/prices/20230323", params={"zone": "SUD"})
+        assert await response.json() == {"0": 120.0}
+        response = await client.get("/mgp/pun/20230323")
+        assert await response.json() == 128.69
+        response = await client.get("/mgp/zonal-prices/20230323")
+        assert await response.json() == {"PUN": {"0": 128.69}, "SUD": {"0": 120.0}}
+        assert len(transport.requests) == 1
+
+    async def test_errors(self, client):
+        response = await client.get("/mgp/prices/20230323", params={"zone": "NORD"})
+        assert response.status == 404
+        response = await client.get("/mgp/prices/2023-03-23")
+        assert response.status == 400
+        response = await client.get("/GetMercatiGas")
+        assert response.status == 502
+        response = await client.get("/GetNothing")
+        assert response.status == 404
+        response = await client.get("/GetNothing/20230323")
+        assert response.status == 404
+        response = await client.get("/nothing")
+        assert response.status == 404
+
+    async def test_command_line(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        args = ["--cache-path", path, "--concurrency", "2", "--max-entries", "5"]
+        gme = _create_client(_parser().parse_args(args))
+        assert gme.cache.max_entries == 5
+        assert gme.mgp.limiter is gme.limiter
+        assert gme.breaker is not None
+        await gme.close()
+        await gme.cache.close()
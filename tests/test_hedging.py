@@ -0,0 +1,86 @@
+"""Test the hedged requests."""
+import asyncio
+import pytest
+from mercati_energetici import MercatiElettrici, FakeTransport, HedgePolicy
+
+MARKETS = [{"data": 20230323, "mercato": "MGP", "volumi": 1.0}]
+
+
+class SlowTransport(FakeTransport):
+    """Fake transport taking the given latency for each request."""
+
+    def __init__(self, latencies):
+        super().__init__({"/GetMercatiElettrici": MARKETS})
+        self.latencies = list(latencies)
+        self.cancelled = 0
+
+    async def get(self, url, headers):
+        try:
+            await asyncio.sleep(self.latencies.pop(0))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return await super().get(url, headers)
+
+
+class TestHedgePolicy:
+    def test_delay(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10)
+        for latency in range(9):
+            policy.record_latency(latency)
+        assert policy.delay() is None
+        policy.record_latency(9)
+        assert policy.delay() == 8
+
+    def test_budget(self):
+        policy = HedgePolicy(max_hedge_ratio=0.1)
+        assert not policy.can_hedge()
+        for _ in range(9):
+            policy.record_request(False)
+        assert policy.can_hedge()
+        policy.record_request(True)
+        assert not policy.can_hedge()
+
+
+@pytest.mark.asyncio
+class TestHedgedRequests:
+    async def test_hedge(self):
+        policy = HedgePolicy(min_samples=1)
+        for _ in range(10):
+            policy.record_request(False)
+        policy.record_latency(0.01)
+        transport = SlowTransport([10, 0])
+        async with MercatiElettrici(transport=transport, hedging=policy) as me:
+            assert await asyncio.wait_for(me.get_markets(), 1) == MARKETS
+            await asyncio.sleep(0)
+        assert len(transport.requests) == 1
+        assert transport.cancelled == 1
+
+    async def test_no_hedge_without_samples(self):
+        transport = SlowTransport([0.01])
+        async with MercatiElettrici(transport=transport, hedging=HedgePolicy()) as me:
+            assert await me.get_markets() == MARKETS
+        assert transport.cancelled == 0
+
+    async def test_limiter(self):
+        policy = HedgePolicy(min_samples=1, max_hedge_ratio=1)
+        policy.record_latency(0.01)
+        transport = SlowTransport([0.1, 0.1])
+        limiter = asyncio.Semaphore(1)
+        async with MercatiElettrici(
+            transport=transport, hedging=policy, limiter=limiter
+        ) as me:
+            assert await me.get_markets() == MARKETS
+        # No free slot for the hedge
+        assert transport.latencies == [0.1]
+        assert policy._latencies[-1] >= 0.1
+
+        transport = SlowTransport([10, 0])
+        limiter = asyncio.Semaphore(2)
+        async with MercatiElettrici(
+            transport=transport, hedging=policy, limiter=limiter
+        ) as me:
+            assert await asyncio.wait_for(me.get_markets(), 1) == MARKETS
+            await asyncio.sleep(0)
+        assert transport.latencies == [] and transport.cancelled == 1
+        assert not limiter.locked()
@@ -0,0 +1,65 @@
+"""Test the fetch/parse/sink pipeline."""
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from mercati_energetici import MercatiElettrici, FakeTransport, run_pipeline
+
+
+def parse(day, data):
+    return [record["prezzo"] for record in data]
+
+
+@pytest.mark.asyncio
+class TestPipeline:
+    async def test_pipeline(self):
+        days = [f"202303{day:02}" for day in range(1, 21)]
+        transport = FakeTransport(
+            {
+                f"/GetPrezziME/{day}/MGP": [{"ora": 1, "prezzo": float(day)}]
+                for day in days
+            },
+            latency=0.001,
+        )
+        stored = {}
+        async with MercatiElettrici(transport=transport) as me:
+            with ThreadPoolExecutor(2) as executor:
+                count = await run_pipeline(
+                    days,
+                    fetch=lambda day: me.get_prices("MGP", day),
+                    parse=parse,
+                    sink=stored.__setitem__,
+                    executor=executor,
+                )
+        assert count == 20
+        assert stored == {day: [float(day)] for day in days}
+
+    async def test_backpressure(self):
+        in_flight = 0
+        peak = 0
+
+        async def fetch(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            return item
+
+        async def sink(item, data):
+            nonlocal in_flight
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+        count = await run_pipeline(
+            range(100), fetch, sink, fetch_workers=2, parse_workers=1, queue_size=2
+        )
+        assert count == 100
+        # Two queues, the workers of each stage and the sink
+        assert peak <= 2 * 2 + 2 + 1 + 1
+
+    async def test_error(self):
+        async def fetch(item):
+            if item == 5:
+                raise ValueError(item)
+            return item
+
+        with pytest.raises(ValueError):
+            await run_pipeline(range(10), fetch, lambda item, data: None)
@@ -0,0 +1,57 @@
+"""Test the profiling mode."""
+import asyncio
+import tracemalloc
+import pytest
+from mercati_energetici import MGP, FakeTransport, MemoryCache, Profiler
+
+VOLUMES = [
+    {
+        "data": 20230323,
+        "ora": 1,
+        "mercato": "MGP",
+        "zona": "NORD",
+        "acquisti": 1.0,
+        "vendite": 2.0,
+    },
+]
+
+
+@pytest.mark.asyncio
+class TestProfiler:
+    async def test_stages(self):
+        profiler = Profiler()
+        transport = FakeTransport({"/GetQuantitaME/20230323/MGP": VOLUMES})
+        async with MGP(transport=transport, profiler=profiler) as mgp:
+            await mgp.get_volumes("20230323", zone="NORD")
+            await mgp.get_volumes("20230323", zone="NORD")
+        stages = {stage for method, stage in profiler.stages}
+        methods = {method for method, stage in profiler.stages}
+        assert stages == {"connect", "transfer", "decode", "transform", "total"}
+        # Stages of nested calls are attributed to the outermost method
+        assert methods == {"MGP.get_volumes"}
+        assert profiler.stages[("MGP.get_volumes", "total")].count == 2
+        report = profiler.report()
+        assert "MGP.get_volumes" in report and "transform" in report
+        profiler.reset()
+        assert not profiler.stages
+
+    async def test_background_refresh(self):
+        profiler = Profiler()
+        transport = FakeTransport({"/GetQuantitaME/20230323/MGP": VOLUMES})
+        cache = MemoryCache(ttl=0, max_stale=60)
+        async with MGP(transport=transport, profiler=profiler, cache=cache) as mgp:
+            await mgp.get_volumes("20230323", zone="NORD")
+            await mgp.get_volumes("20230323", zone="NORD")
+            await asyncio.gather(*mgp._refreshing.values())
+        assert len(transport.requests) == 2
+        assert profiler.stages[("MGP.get_volumes", "decode")].count == 1
+        assert profiler.stages[("-", "decode")].count == 1
+
+    async def test_allocations(self):
+        profiler = Profiler(trace_allocations=True)
+        transport = FakeTransport({"/GetQuantitaME/20230323/MGP": VOLUMES})
+        async with MGP(transport=transport, profiler=profiler) as mgp:
+            await mgp.get_volumes("20230323", zone="NORD")
+        assert profiler.allocations["MGP.get_volumes"].calls == 1
+        assert "KiB allocated per call" in profiler.report()
+        tracemalloc.stop()
@@ -0,0 +1,75 @@
+"""Test the time series."""
+import math
+import pytest
+from datetime import date
+from mercati_energetici import MGP, FakeTransport, TimeSeries
+from mercati_energetici.exceptions import MercatiEnergeticiZoneError
+from mercati_energetici.timeseries import periods_in_day
+
+
+class TestTimeSeries:
+    def test_periods_in_day(self):
+        assert periods_in_day(date(2023, 3, 25)) == 24
+        assert periods_in_day(date(2023, 3, 26)) == 23
+        assert periods_in_day(date(2023, 10, 29)) == 25
+        assert periods_in_day(date(2023, 10, 29), 15) == 100
+
+    def test_from_records(self):
+        records = [{"ora": h, "zona": "PUN", "prezzo": float(h)} for h in range(1, 24)]
+        series = TimeSeries.from_records(date(2023, 3, 26), records, "prezzo", "PUN")
+        assert series.resolution == 60
+        assert len(series) == 23
+        assert series.to_dict() == {h - 1: float(h) for h in range(1, 24)}
+        records = [{"periodo": p, "prezzo": 1.0} for p in range(1, 97)]
+        series = TimeSeries.from_records(date(2023, 3, 25), records, "prezzo")
+        assert series.resolution == 15
+        assert len(series) == 96
+        partial = TimeSeries.from_records(date(2023, 3, 25), records[:3], "prezzo")
+        assert partial.resolution == 15 and len(partial) == 96
+        assert partial[2] == 1.0 and math.isnan(partial[5])
+        records = [{"ora": h, "prezzo": 1.0} for h in range(1, 4)]
+        series = TimeSeries.from_records(date(2023, 3, 25), records, "prezzo", None, 15)
+        assert len(series) == 96 and series[2] == 1.0
+        with pytest.raises(ValueError):
+            TimeSeries.from_records(date(2023, 3, 26), [{"ora": 24, "p": 1.0}], "p")
+
+    def test_resample(self):
+        series = TimeSeries(date(2023, 3, 25), 15)
+        for period in range(len(series)):
+            series.values[period] = period
+        hourly = series.resample(60)
+        assert len(hourly) == 24
+        assert hourly[0] == 1.5
+        assert series.resample(60, how="sum")[1] == 4 + 5 + 6 + 7
+        quarters = hourly.resample(15)
+        assert list(quarters)[:5] == [1.5, 1.5, 1.5, 1.5, 5.5]
+        assert hourly.resample(15, how="sum")[0] == 1.5 / 4
+        with pytest.raises(ValueError):
+            hourly.resample(25)
+        with pytest.raises(ValueError, match="23 hours"):
+            TimeSeries(date(2023, 3, 26)).resample(120)
+        assert len(TimeSeries(date(2023, 10, 29), 15).resample(60, "sum")) == 25
+        with pytest.raises(ValueError):
+            TimeSeries(date(2023, 3, 25), values=series.values)
+
+
+@pytest.mark.asyncio
+class TestMGPSeries:
+    async def test_price_series(self):
+        records = [
+            {
+                "data": 20231029,
+                "ora": h,
+                "mercato": "MGP",
+                "zona": "PUN",
+                "prezzo": 10.0,
+            }
+            for h in range(1, 26)
+        ]
+        transport = FakeTransport({"/GetPrezziME/20231029/MGP": records})
+        async with MGP(transport=transport) as mgp:
+            series = await mgp.get_price_series("20231029")
+            assert len(series) == 25
+            assert series.mean() == 10.0
+            with pytest.raises(MercatiEnergeticiZoneError):
+                await mgp.get_price_series("20231029", zone="NONEXISTENT")
@@ -0,0 +1,111 @@
+"""Test the HTTP transports."""
+import pytest, pytest_asyncio
+from mercati_energetici import MercatiElettrici, FakeTransport
+from yarl import URL
+from mercati_energetici.transports import TransportResponse
+from mercati_energetici.exceptions import (
+    MercatiEnergeticiConnectionError,
+    MercatiEnergeticiRequestError,
+    MercatiEnergeticiError,
+)
+
+PRICES = [
+    {"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "PUN", "prezzo": 128.69},
+    {"data": 20230323, "ora": 2, "mercato": "MGP", "zona": "PUN", "prezzo": 120.0},
+]
+
+
+@pytest_asyncio.fixture
+async def transport():
+    transport = FakeTransport(
+        {
+            "/GetPrezziME/20230323/MGP": PRICES,
+            "/GetPrezziME/20230324/MGP": [],
+            "/GetMercatiElettrici": TransportResponse(502, "text/html", b"Bad Gateway"),
+            "/GetLiquidita/20230323": TransportResponse(200, "text/html", b"<html>"),
+        }
+    )
+    yield transport
+    await transport.close()
+
+
+@pytest.mark.asyncio
+class TestFakeTransport:
+    async def test_request(self, transport):
+        async with MercatiElettrici(transport=transport) as me:
+            assert await me.get_prices("MGP", "20230323") == PRICES
+        assert transport.requests == ["/GetPrezziME/20230323/MGP"]
+
+    async def test_errors(self, transport):
+        async with MercatiElettrici(transport=transport) as me:
+            with pytest.raises(MercatiEnergeticiRequestError):
+                await me.get_prices("MGP", "20230324")
+            with pytest.raises(MercatiEnergeticiRequestError):
+                await me.get_volumes("MGP", "20230323")
+            with pytest.raises(MercatiEnergeticiConnectionError):
+                await me.get_markets()
+            with pytest.raises(MercatiEnergeticiError):
+                await me.get_liquidity("20230323")
+
+    async def test_callable_response(self):
+        transport = FakeTransport(
+            {"/GetMercatiElettrici": lambda path: [{"path": path}]}
+        )
+        async with MercatiElettrici(transport=transport) as me:
+            assert await me.get_markets() == [{"path": "/GetMercatiElettrici"}]
+
+
+@pytest.mark.asyncio
+class TestHTTP2Transport:
+    @pytest.fixture
+    def httpx(self):
+        return pytest.importorskip("httpx")
+
+    def transport(self, httpx, handler):
+        from mercati_energetici import HTTP2Transport
+
+        transport = HTTP2Transport()
+        transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return transport
+
+    async def test_response(self, httpx):
+        def handler(request):
+            assert request.url.path == "/GetPrezziME/20230323/MGP"
+            assert request.headers["x-requested-with"] == "darcato/mercati-energetici"
+            return httpx.Response(200, json=PRICES)
+
+        transport = self.transport(httpx, handler)
+        async with MercatiElettrici(transport=transport) as me:
+            assert await me.get_prices("MGP", "20230323") == PRICES
+        await transport.close()
+
+    async def test_status_mapping(self, httpx):
+        responses = {
+            "/GetPrezziME/20230323/MGP": httpx.Response(404, text="Not Found"),
+            "/GetMercatiElettrici": httpx.Response(502, text="Bad Gateway"),
+            "/GetLiquidita/20230323": httpx.Response(200, html="<html>"),
+        }
+        transport = self.transport(httpx, lambda request: responses[request.url.path])
+        response = await transport.get(
+            URL("https://example.com/GetLiquidita/20230323"), {}
+        )
+        assert response.status == 200
+        assert response.content_type.startswith("text/html")
+        assert response.body == b"<html>"
+        async with MercatiElettrici(transport=transport) as me:
+            with pytest.raises(MercatiEnergeticiRequestError):
+                await me.get_prices("MGP", "20230323")
+            with pytest.raises(MercatiEnergeticiConnectionError):
+                await me.get_markets()
+            with pytest.raises(MercatiEnergeticiError):
+                await me.get_liquidity("20230323")
+        await transport.close()
+
+    async def test_connection_error(self, httpx):
+        def handler(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        transport = self.transport(httpx, handler)
+        with pytest.raises(MercatiEnergeticiConnectionError):
+            await transport.get(URL("https://example.com/GetMercatiElettrici"), {})
+        await transport.close()
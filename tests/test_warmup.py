@@ -0,0 +1,76 @@
+"""Test the cache warm-up."""
+import asyncio
+import pytest
+from datetime import date
+from mercati_energetici import GME, FakeTransport, MemoryCache, WarmupSpec
+
+PRICES = [{"data": 20230323, "ora": 1, "mercato": "MGP", "zona": "PUN", "prezzo": 1.0}]
+
+
+class TestWarmupSpec:
+    def test_uris(self):
+        spec = WarmupSpec(
+            "GetPrezziME", ["MGP", "MI-A1"], days=2, end=date(2023, 3, 23)
+        )
+        assert spec.uris() == [
+            "/GetPrezziME/20230323/MGP",
+            "/GetPrezziME/20230323/MI-A1",
+            "/GetPrezziME/20230322/MGP",
+            "/GetPrezziME/20230322/MI-A1",
+        ]
+        spec = WarmupSpec("GetLiquidita", days=1, end=date(2023, 3, 23))
+        assert spec.uris() == ["/GetLiquidita/20230323"]
+        spec = WarmupSpec(
+            "GetEsitiGasAsta",
+            ["MGP-{next_day:%Y-%m-%d}"],
+            days=1,
+            end=date(2023, 3, 23),
+        )
+        assert spec.uris() == ["/GetEsitiGasAsta/20230323/MGP-2023-03-24"]
+
+
+@pytest.mark.asyncio
+class TestWarmup:
+    async def test_warm_up(self):
+        transport = FakeTransport(
+            {"/GetPrezziME/20230323/MGP": PRICES, "/GetPrezziME/20230322/MGP": PRICES}
+        )
+        updates = []
+        specs = [WarmupSpec("GetPrezziME", ["MGP"], days=3, end=date(2023, 3, 23))]
+        async with GME(transport=transport, cache=MemoryCache()) as gme:
+            progress = await gme.warm_up(
+                specs, progress=lambda p: updates.append(p.done)
+            )
+            assert progress.completed
+            assert progress.done == 2
+            assert list(progress.failed) == ["/GetPrezziME/20230321/MGP"]
+            assert len(updates) == 3
+            await gme.mgp.get_prices(date(2023, 3, 23))
+        assert len(transport.requests) == 3
+
+    async def test_deadline(self):
+        transport = FakeTransport({"/GetPrezziME/20230323/MGP": PRICES}, latency=10)
+        specs = [WarmupSpec("GetPrezziME", ["MGP"], days=3, end=date(2023, 3, 23))]
+        async with GME(transport=transport, cache=MemoryCache()) as gme:
+            progress = await gme.warm_up(specs, concurrency=1, deadline=0.05)
+        assert progress.done == 0
+        assert len(progress.failed) == 3
+        assert progress.completed
+
+    async def test_cancel(self):
+        transport = FakeTransport(latency=0.02)
+        specs = [WarmupSpec("GetLiquidita", days=20, end=date(2023, 3, 23))]
+        async with GME(transport=transport, cache=MemoryCache()) as gme:
+            task = asyncio.ensure_future(gme.warm_up(specs, concurrency=2))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            sent = len(transport.requests)
+            await asyncio.sleep(0.1)
+            assert len(transport.requests) == sent
+
+    async def test_requires_cache(self):
+        async with GME(transport=FakeTransport()) as gme:
+            with pytest.raises(ValueError):
+                await gme.warm_up([WarmupSpec("GetLiquidita")])